@@ -0,0 +1,67 @@
+import os
+import time
+import threading
+import http.client
+from easyLite import eL
+
+DB_FILE = 'bench_store.db'
+ROWS = 20000
+CLIENTS = 8
+SECONDS = 3
+
+
+# Hammer the service with keep-alive clients and return requests/sec
+def run_clients(port, paths, seconds=SECONDS, clients=CLIENTS, revalidate=False):
+    counts = [0] * clients
+    stop = time.monotonic() + seconds
+
+    def client(n):
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        etags = {}
+        i = 0
+        while time.monotonic() < stop:
+            path = paths[(n + i) % len(paths)]
+            headers = {'If-None-Match': etags[path]} if revalidate and path in etags else {}
+            conn.request('GET', path, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            etags[path] = resp.getheader('ETag')
+            counts[n] += 1
+            i += 1
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(counts) / seconds
+
+
+def main():
+    if os.path.exists(DB_FILE):
+        os.remove(DB_FILE)
+    db = eL().connect(DB_FILE)
+    db.newTable('items').PK().textCol('name').intCol('category').floatCol('price').create()
+    db.insertIn('items').multiRows([[f'item {i}', i % 50, i * 0.5] for i in range(ROWS)]).record()
+
+    paths = [f'/items?fields=id,name,price&category={c}&limit=100' for c in range(50)]
+
+    print('\n[Bench] Uncached (cache_size=0)\n')
+    server = db.serve(port=0, cache_size=0)
+    print(f"{run_clients(server.address[1], paths):.0f} requests/sec")
+    server.stop()
+
+    print('\n[Bench] Cached responses\n')
+    server = db.serve(port=0)
+    print(f"{run_clients(server.address[1], paths):.0f} requests/sec")
+
+    print('\n[Bench] Cached, clients revalidating with If-None-Match (304)\n')
+    print(f"{run_clients(server.address[1], paths, revalidate=True):.0f} requests/sec")
+    server.stop()
+
+    db.close()
+    os.remove(DB_FILE)
+
+if __name__ == "__main__":
+    main()
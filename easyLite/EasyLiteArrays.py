@@ -0,0 +1,88 @@
+# EasyLiteArrays.py
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+# Map a declared SQLite column type to a NumPy dtype (SQLite affinity rules)
+def _numpyDtype(declared_type: str) -> str:
+    t = (declared_type or "").upper()
+    if "INT" in t:
+        return "int64"
+    if "REAL" in t or "FLOA" in t or "DOUB" in t:
+        return "float64"
+    if "DATETIME" in t or "TIMESTAMP" in t:
+        return "datetime64[s]"
+    if "DATE" in t:
+        return "datetime64[D]"
+    return "object"
+
+
+# Guess a NumPy dtype from the first non-NULL Python value of a column
+def _guessDtype(values: Iterable[Any]) -> str:
+    for v in values:
+        if v is None:
+            continue
+        if isinstance(v, bool) or isinstance(v, int):
+            return "int64"
+        if isinstance(v, float):
+            return "float64"
+        return "object"
+    return "object"
+
+
+# Widest dtype needed to store values of the given NumPy kind in a column of the given dtype (SQLite
+# columns can hold any type, e.g. REAL or TEXT values in an INTEGER column, which NumPy would truncate)
+def _widenDtype(dtype, kind: str) -> str:
+    if dtype.kind == "i" and kind not in "ib":
+        return "float64" if kind == "f" else "object"
+    if dtype.kind == "f" and kind not in "ibf":
+        return "object"
+    return dtype.name
+
+
+# Fill masked arrays chunk by chunk from a row source (capacity is a size hint, arrays double when it is exceeded)
+def _fillArrays(chunks: Iterable[List[Tuple[Any]]], capacity: int, columns: List[str], dtypes: List[str]) -> Dict[str, Any]:
+    import numpy as np
+
+    capacity = max(capacity, 1)
+    data = [np.empty(capacity, dtype=dt) for dt in dtypes]
+    masks = [np.zeros(capacity, dtype=bool) for _ in dtypes]
+    fills = [None if dt == "object" else np.zeros(1, dtype=dt)[0] for dt in dtypes]
+    pos = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        end = pos + len(chunk)
+        if end > capacity:
+            capacity = max(end, capacity * 2)
+            data = [np.resize(d, capacity) for d in data]
+            masks = [np.resize(m, capacity) for m in masks]
+        for i, col_vals in enumerate(zip(*chunk)):
+            mask = masks[i][pos:end]
+            mask[:] = [v is None for v in col_vals]
+            if mask.any():
+                col_vals = [fills[i] if v is None else v for v in col_vals]
+            if data[i].dtype.kind in "if":
+                converted = np.asarray(col_vals)
+                wide = _widenDtype(data[i].dtype, converted.dtype.kind)
+                if wide == data[i].dtype.name:
+                    col_vals = converted
+                else:
+                    data[i], fills[i], col_vals = _upcast(data[i], wide, mask, col_vals)
+            try:
+                data[i][pos:end] = col_vals
+            except (ValueError, TypeError, OverflowError):
+                data[i], fills[i], col_vals = _upcast(data[i], "object", mask, col_vals)
+                data[i][pos:end] = col_vals
+        pos = end
+    data = [d[:pos] for d in data]
+    masks = [m[:pos] for m in masks]
+    return {col: np.ma.MaskedArray(d, mask=m) for col, d, m in zip(columns, data, masks)}
+
+
+# Internal helper converting a column array to a wider dtype, with the chunk's NULLs set to the new fill value
+def _upcast(array, dtype: str, mask, values):
+    import numpy as np
+
+    fill = None if dtype == "object" else np.zeros(1, dtype=dtype)[0]
+    values = [fill if null else v for v, null in zip(values, mask)]
+    return array.astype(dtype), fill, values
@@ -0,0 +1,72 @@
+# EasyLiteBlob.py
+import io
+import sqlite3
+
+
+# File-like, chunked access to a single BLOB cell through SQLite incremental blob I/O
+class EasyLiteBlob(io.RawIOBase):
+    # Constructor
+    def __init__(self, connection: sqlite3.Connection, table_name: str, column: str, rowid: int, readonly: bool = True, commit=None):
+        super().__init__()
+        self.connection = connection
+        # Writes are committed through the owner (which defers the commit during a bulk-load session)
+        self._commit = commit or connection.commit
+        self.table_name = table_name
+        self.column = column
+        self.rowid = rowid
+        self._readonly = readonly
+        self._blob = connection.blobopen(table_name, column, rowid, readonly=readonly)
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return not self._readonly
+
+    def seekable(self) -> bool:
+        return True
+
+    # Total size of the cell in bytes
+    def size(self) -> int:
+        return len(self._blob)
+
+    # Read up to len(buffer) bytes straight into a caller-owned buffer (bytearray, memoryview, array...)
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        data = self._blob.read(len(view))
+        n = len(data)
+        view[:n] = data
+        return n
+
+    def read(self, size: int = -1) -> bytes:
+        return self._blob.read(size)
+
+    # Overwrite bytes at the current position (the cell size cannot change)
+    def write(self, data) -> int:
+        if self._readonly:
+            raise io.UnsupportedOperation("Blob was opened read-only.")
+        view = memoryview(data).cast("B")
+        self._blob.write(view)
+        return len(view)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._blob.seek(offset, whence)
+        return self._blob.tell()
+
+    def tell(self) -> int:
+        return self._blob.tell()
+
+    # Iterate over the cell in fixed-size chunks
+    def chunks(self, chunk_size: int = 1 << 20):
+        while True:
+            data = self._blob.read(chunk_size)
+            if not data:
+                return
+            yield data
+
+    def close(self):
+        if not self.closed:
+            self._blob.close()
+            if not self._readonly:
+                self._commit()
+        super().close()
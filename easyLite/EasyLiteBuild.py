@@ -1,5 +1,10 @@
 # EasyLiteBuild.py
+import re
 import sqlite3
+from .EasyLiteCodec import codecType, parseCodecType, encoder
+
+# Name of the change-data-capture log table shared by all tracked tables
+CHANGE_LOG_TABLE = "easylite_changes"
 
 # Class for building or modifying tables
 class EasyLiteBuild:
@@ -24,15 +29,29 @@ class EasyLiteBuild:
         self._pk_defined = True
         return self
 
-    # Create a TEXT column
-    def textCol(self, name: str, constraints: str = ""):
+    # Create a TEXT column (optionally compressed with a codec, e.g. "zlib" or "lzma")
+    def textCol(self, name: str, constraints: str = "", codec: str = None):
+        ctype = codecType("TEXT", codec) if codec else "TEXT"
+        if self.mode == "modtable" and self._col_to_modify:
+            cd = self._buildColumnDef(name, ctype, constraints)
+            self._modifyColumn(self._col_to_modify, cd)
+            self._col_to_modify = None
+            return self
+        if self.mode in ["newtable", "addcolumns"]:
+            cd = self._buildColumnDef(name, ctype, constraints)
+            self._cols_def.append(cd)
+        return self
+
+    # Create a BLOB column (optionally compressed with a codec, e.g. "zlib" or "lzma")
+    def blobCol(self, name: str, constraints: str = "", codec: str = None):
+        ctype = codecType("BLOB", codec) if codec else "BLOB"
         if self.mode == "modtable" and self._col_to_modify:
-            cd = self._buildColumnDef(name, "TEXT", constraints)
+            cd = self._buildColumnDef(name, ctype, constraints)
             self._modifyColumn(self._col_to_modify, cd)
             self._col_to_modify = None
             return self
         if self.mode in ["newtable", "addcolumns"]:
-            cd = self._buildColumnDef(name, "TEXT", constraints)
+            cd = self._buildColumnDef(name, ctype, constraints)
             self._cols_def.append(cd)
         return self
 
@@ -101,6 +120,111 @@ class EasyLiteBuild:
             print(f"[ERROR] Failed to create table '{self.table_name}': {e}")
         return self
 
+    # Install triggers logging every insert, update and delete into the change log
+    def trackChanges(self):
+        t = self.table_name
+        log = CHANGE_LOG_TABLE
+        try:
+            c = self.connection.cursor()
+            c.execute(f"CREATE TABLE IF NOT EXISTS {log} ( seq INTEGER PRIMARY KEY AUTOINCREMENT, table_name TEXT NOT NULL, row_id INTEGER NOT NULL, op TEXT NOT NULL, ts TEXT DEFAULT CURRENT_TIMESTAMP );")
+            c.execute(f"CREATE INDEX IF NOT EXISTS {log}_table_seq ON {log} (table_name, seq);")
+            c.execute(f"CREATE INDEX IF NOT EXISTS {log}_table_row ON {log} (table_name, row_id, seq);")
+            c.execute(f"""CREATE TRIGGER IF NOT EXISTS {t}_cdc_insert AFTER INSERT ON {t} BEGIN
+                INSERT INTO {log} (table_name, row_id, op) VALUES ('{t}', NEW.rowid, 'I');
+            END;""")
+            c.execute(f"""CREATE TRIGGER IF NOT EXISTS {t}_cdc_update AFTER UPDATE ON {t} BEGIN
+                INSERT INTO {log} (table_name, row_id, op) SELECT '{t}', OLD.rowid, 'D' WHERE OLD.rowid != NEW.rowid;
+                INSERT INTO {log} (table_name, row_id, op) VALUES ('{t}', NEW.rowid, 'U');
+            END;""")
+            c.execute(f"""CREATE TRIGGER IF NOT EXISTS {t}_cdc_delete AFTER DELETE ON {t} BEGIN
+                INSERT INTO {log} (table_name, row_id, op) VALUES ('{t}', OLD.rowid, 'D');
+            END;""")
+            self.connection.commit()
+            print(f"[SUCCESS] Change tracking enabled on '{t}'.")
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            print(f"[ERROR] Failed to enable change tracking on '{t}': {e}")
+        return self
+
+    # Remove the change-tracking triggers (logged entries are kept)
+    def untrackChanges(self):
+        t = self.table_name
+        try:
+            c = self.connection.cursor()
+            for op in ("insert", "update", "delete"):
+                c.execute(f"DROP TRIGGER IF EXISTS {t}_cdc_{op};")
+            self.connection.commit()
+            print(f"[SUCCESS] Change tracking disabled on '{t}'.")
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to disable change tracking on '{t}': {e}")
+        return self
+
+    # Create an external-content FTS5 index over TEXT columns, kept in sync by triggers
+    def fullText(self, *columns: str, tokenizer: str = "unicode61"):
+        t = self.table_name
+        fts = f"{t}_fts"
+        cols = ", ".join(columns)
+        new_cols = ", ".join(f"NEW.{col}" for col in columns)
+        old_cols = ", ".join(f"OLD.{col}" for col in columns)
+        try:
+            c = self.connection.cursor()
+            c.execute(f"PRAGMA table_info({t});")
+            existing = {col[1] for col in c.fetchall()}
+            missing = [col for col in columns if col not in existing]
+            if not columns or missing:
+                print(f"[ERROR] Failed to create full-text index on '{t}': unknown column(s) {', '.join(missing) or '(none given)'}.")
+                return self
+            # Explicit transaction: the legacy sqlite3 mode would autocommit each CREATE on its own
+            self.connection.commit()
+            c.execute("BEGIN;")
+            c.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{t}', content_rowid='rowid', tokenize='{tokenizer}');")
+            c.execute(f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {t} BEGIN
+                INSERT INTO {fts} (rowid, {cols}) VALUES (NEW.rowid, {new_cols});
+            END;""")
+            c.execute(f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {t} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', OLD.rowid, {old_cols});
+            END;""")
+            c.execute(f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {t} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', OLD.rowid, {old_cols});
+                INSERT INTO {fts} (rowid, {cols}) VALUES (NEW.rowid, {new_cols});
+            END;""")
+            c.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild');")
+            c.execute("COMMIT;")
+            print(f"[SUCCESS] Full-text index '{fts}' created on '{t}' ({cols}).")
+        except sqlite3.Error as e:
+            if self.connection.in_transaction:
+                c.execute("ROLLBACK;")
+            print(f"[ERROR] Failed to create full-text index on '{t}': {e}")
+        return self
+
+    # Rebuild and/or optimize the FTS5 index (e.g. after a bulk load)
+    def rebuildFullText(self, optimize: bool = True):
+        fts = f"{self.table_name}_fts"
+        try:
+            c = self.connection.cursor()
+            c.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild');")
+            if optimize:
+                c.execute(f"INSERT INTO {fts} ({fts}) VALUES ('optimize');")
+            self.connection.commit()
+            print(f"[SUCCESS] Full-text index '{fts}' rebuilt.")
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to rebuild full-text index '{fts}': {e}")
+        return self
+
+    # Remove the FTS5 index and its sync triggers
+    def dropFullText(self):
+        fts = f"{self.table_name}_fts"
+        try:
+            c = self.connection.cursor()
+            for suffix in ("ai", "ad", "au"):
+                c.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix};")
+            c.execute(f"DROP TABLE IF EXISTS {fts};")
+            self.connection.commit()
+            print(f"[SUCCESS] Full-text index '{fts}' dropped.")
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to drop full-text index '{fts}': {e}")
+        return self
+
     # Switch to addcolumns mode
     def add(self):
         if self.mode != "addcolumns":
@@ -147,6 +271,95 @@ class EasyLiteBuild:
         self._col_to_modify = old_col_name
         return self
 
+    # Compress an existing TEXT/BLOB column in place and report the savings
+    def compressCol(self, column_name: str, codec: str = "zlib"):
+        if self.mode != "modtable":
+            raise ValueError("compressCol() can only be used in 'modtable' mode.")
+        t = self.table_name
+        info = self._getTableInfo()
+        columns = {col[1]: col for col in info}
+        if column_name not in columns:
+            print(f"[ERROR] Column '{column_name}' does not exist in '{t}'.")
+            return self
+        declared = columns[column_name][2]
+        if parseCodecType(declared):
+            print(f"[WARNING] Column '{column_name}' in '{t}' is already compressed.")
+            return self
+        base = "BLOB" if "BLOB" in declared.upper() else "TEXT"
+        new_type = codecType(base, codec)
+        c = self.connection.cursor()
+        try:
+            c.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?;", (t,))
+            table_sql = c.fetchone()[0]
+            # Only the column's declared type is rewritten, so AUTOINCREMENT, constraints and FKs survive the rebuild
+            pattern = r'([(,]\s*["`\[]?' + re.escape(column_name) + r'["`\]]?)' + (r"\s+" + re.escape(declared) if declared else "") + r"(?=[\s,)])"
+            body, found = re.subn(pattern, lambda m: f"{m.group(1)} {new_type}", table_sql[table_sql.index("("):], flags=re.IGNORECASE)
+            if found != 1:
+                print(f"[ERROR] Failed to compress column '{column_name}' in '{t}': its declaration could not be located in the table definition.")
+                return self
+            # Indexes and triggers are dropped with the table: keep their SQL to recreate them afterwards
+            c.execute("SELECT type, name, sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL;", (t,))
+            attached = c.fetchall()
+            readers = [name for kind, name, sql in attached if kind == "trigger" and re.search(rf"\b(NEW|OLD)\.{re.escape(column_name)}\b", sql, re.IGNORECASE)]
+            if readers:
+                print(f"[ERROR] Failed to compress column '{column_name}' in '{t}': it is read by trigger(s) {', '.join(readers)} (full-text index or summary table), which would see compressed bytes.")
+                return self
+            sequence = None
+            if c.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence';").fetchone():
+                row = c.execute("SELECT seq FROM sqlite_sequence WHERE name = ?;", (t,)).fetchone()
+                sequence = row[0] if row else None
+            c.execute(f"SELECT COALESCE(SUM(LENGTH(CAST({column_name} AS BLOB))), 0) FROM {t};")
+            before = c.fetchone()[0]
+            c.execute("PRAGMA page_count;")
+            pages_before = c.fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to compress column '{column_name}' in '{t}': {e}")
+            return self
+        self.connection.create_function("easylite_encode", 1, encoder(codec, base), deterministic=True)
+        stored = "text" if base == "TEXT" else "blob"
+        names = [col[1] for col in info]
+        values = [f"CASE WHEN typeof({n}) = '{stored}' THEN easylite_encode({n}) ELSE {n} END" if n == column_name else n for n in names]
+        rowid = "" if "WITHOUT ROWID" in table_sql.upper() else "rowid, "
+        temp = f"{t}_temp_compress"
+        # FK actions must not fire while the old table is dropped; restored afterwards
+        foreign_keys = c.execute("PRAGMA foreign_keys;").fetchone()[0]
+        try:
+            # Explicit transaction: the rebuild, its indexes, triggers and AUTOINCREMENT counter commit together
+            self.connection.commit()
+            c.execute("PRAGMA foreign_keys = OFF;")
+            c.execute("PRAGMA legacy_alter_table = ON;")
+            c.execute("BEGIN;")
+            c.execute(f"CREATE TABLE {temp} {body};")
+            c.execute(f"INSERT INTO {temp} ({rowid}{', '.join(names)}) SELECT {rowid}{', '.join(values)} FROM {t};")
+            c.execute(f"DROP TABLE {t};")
+            c.execute(f"ALTER TABLE {temp} RENAME TO {t};")
+            for kind, name, sql in attached:
+                c.execute(sql)
+            if sequence is not None:
+                c.execute("DELETE FROM sqlite_sequence WHERE name = ?;", (t,))
+                c.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?);", (t, sequence))
+            c.execute("COMMIT;")
+            c.execute(f"SELECT COALESCE(SUM(LENGTH({column_name})), 0) FROM {t};")
+            after = c.fetchone()[0]
+            c.execute("PRAGMA page_count;")
+            pages_after = c.fetchone()[0]
+            c.execute("PRAGMA freelist_count;")
+            free_pages = c.fetchone()[0]
+            c.execute("PRAGMA page_size;")
+            page_size = c.fetchone()[0]
+            saved = before - after
+            ratio = (saved / before * 100) if before else 0.0
+            print(f"[SUCCESS] Column '{column_name}' in '{t}' compressed with {codec}: {before} -> {after} bytes ({ratio:.1f}% saved), {len(attached)} index(es)/trigger(s) kept.")
+            print(f"[INFO] Pages: {pages_before} -> {pages_after}, {free_pages} free pages ({free_pages * page_size} bytes reclaimable with VACUUM). A full column scan now reads ~{saved} fewer bytes.")
+        except sqlite3.Error as e:
+            if self.connection.in_transaction:
+                c.execute("ROLLBACK;")
+            print(f"[ERROR] Failed to compress column '{column_name}' in '{t}': {e}")
+        finally:
+            c.execute("PRAGMA legacy_alter_table = OFF;")
+            c.execute(f"PRAGMA foreign_keys = {'ON' if foreign_keys else 'OFF'};")
+        return self
+
     # Remove a column
     def remCol(self, column_name: str):
         if self.mode != "modtable":
@@ -0,0 +1,119 @@
+# EasyLiteBulk.py
+import sqlite3
+from typing import Any, Iterable, List, Sequence
+from .EasyLiteCodec import tableEncoders
+
+
+# Bulk-load session: one transaction, secondary indexes dropped, FK checks deferred, relaxed journal
+class EasyLiteBulk:
+    # Constructor
+    def __init__(self, core, table_name: str, drop_indexes: bool = True, relax_journal: bool = True):
+        self.core = core
+        self.connection = core.connection
+        self.table_name = table_name
+        self.drop_indexes = drop_indexes
+        self.relax_journal = relax_journal
+        self.errors: List[Exception] = []
+        self.inserted = 0
+        self.ok = False
+        self._indexes = []
+        self._saved = {}
+
+    def __enter__(self):
+        c = self.connection.cursor()
+        self.connection.commit()
+        self._saved = {
+            "synchronous": c.execute("PRAGMA synchronous;").fetchone()[0],
+            "journal_mode": c.execute("PRAGMA journal_mode;").fetchone()[0],
+        }
+        if self.relax_journal:
+            c.execute("PRAGMA synchronous = OFF;")
+            if self._saved["journal_mode"].lower() != "wal":
+                c.execute("PRAGMA journal_mode = MEMORY;")
+        c.execute("BEGIN;")
+        c.execute("PRAGMA defer_foreign_keys = ON;")
+        if self.drop_indexes:
+            c.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL;", (self.table_name,))
+            self._indexes = c.fetchall()
+            for name, _ in self._indexes:
+                c.execute(f"DROP INDEX {name};")
+        self.core._bulk = self
+        print(f"[SUCCESS] Bulk load on '{self.table_name}' started ({len(self._indexes)} indexes deferred).")
+        return self
+
+    # Insert many rows with executemany; columns default to every non-PK column
+    def rows(self, rows: Iterable[Sequence[Any]], columns: List[str] = None):
+        c = self.connection.cursor()
+        c.execute(f"PRAGMA table_info({self.table_name});")
+        info = c.fetchall()
+        if columns is None:
+            columns = [col[1] for col in info if col[5] == 0]
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        encoders = tableEncoders(info)
+        encode = [encoders.get(name) for name in columns]
+        skip, null = self.core.skip, self.core.null
+
+        # Same value handling as insertIn().multiRows(): sentinels become NULL, codec columns are
+        # compressed, short rows are padded with NULL; rows are converted lazily while executemany runs
+        def prepared():
+            for row in rows:
+                values = []
+                for i, enc in enumerate(encode):
+                    v = row[i] if i < len(row) else None
+                    if v is skip or v is null:
+                        values.append(None)
+                    else:
+                        values.append(enc(v) if enc else v)
+                yield values
+
+        c.executemany(sql, prepared())
+        self.inserted += c.rowcount
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.core._bulk = None
+        c = self.connection.cursor()
+        try:
+            if exc_type is not None or self.errors:
+                raise sqlite3.DatabaseError(str(exc or self.errors[0]))
+            for _, sql in self._indexes:
+                c.execute(sql)
+            violations = c.execute(f"PRAGMA foreign_key_check({self.table_name});").fetchall()
+            if violations:
+                raise sqlite3.IntegrityError(f"{len(violations)} foreign key violations, first: {violations[0]}")
+            self.connection.commit()
+            self.ok = True
+            print(f"[SUCCESS] Bulk load on '{self.table_name}' committed, {len(self._indexes)} indexes rebuilt.")
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            print(f"[ERROR] Bulk load on '{self.table_name}' rolled back: {e}")
+            self._restoreIndexes()
+        finally:
+            self._restore()
+        return False
+
+    # Internal method recreating deferred indexes whose DROP was committed by a statement outside the session (e.g. DDL)
+    def _restoreIndexes(self):
+        c = self.connection.cursor()
+        try:
+            lost = [sql for name, sql in self._indexes
+                    if not c.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?;", (name,)).fetchone()]
+            for sql in lost:
+                c.execute(sql)
+            if lost:
+                self.connection.commit()
+                print(f"[WARNING] Part of the bulk load on '{self.table_name}' was committed by another statement; {len(lost)} indexes recreated.")
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            print(f"[ERROR] Failed to recreate indexes of '{self.table_name}': {e}")
+
+    # Internal method restoring the journal settings
+    def _restore(self):
+        c = self.connection.cursor()
+        try:
+            c.execute(f"PRAGMA synchronous = {int(self._saved['synchronous'])};")
+            if self.relax_journal and self._saved["journal_mode"].lower() != "wal":
+                c.execute(f"PRAGMA journal_mode = {self._saved['journal_mode']};")
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to restore journal settings after bulk load: {e}")
@@ -0,0 +1,64 @@
+# EasyLiteCodec.py
+import lzma
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Available column codecs: name -> (compress, decompress)
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (lambda b: zlib.compress(b, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+
+# Declared column type for a compressed column, e.g. ("TEXT", "zlib") -> "ZLIB_TEXT"
+def codecType(base_type: str, codec: str) -> str:
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec '{codec}'. Available codecs: {', '.join(CODECS)}.")
+    return f"{codec.upper()}_{base_type}"
+
+
+# Parse a declared column type into (codec, base type), or None for plain columns
+def parseCodecType(declared_type: str) -> Optional[Tuple[str, str]]:
+    prefix, _, base = (declared_type or "").partition("_")
+    codec = prefix.lower()
+    if codec in CODECS and base in ("TEXT", "BLOB"):
+        return codec, base
+    return None
+
+
+# Returns a function encoding Python values for a compressed column
+def encoder(codec: str, base_type: str) -> Callable[[Any], Any]:
+    compress = CODECS[codec][0]
+
+    def encode(value):
+        if value is None:
+            return value
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        return compress(bytes(value))
+    return encode
+
+
+# Returns a function decoding stored values of a compressed column (uncompressed legacy values pass through)
+def decoder(codec: str, base_type: str) -> Callable[[Any], Any]:
+    decompress = CODECS[codec][1]
+
+    def decode(value):
+        if not isinstance(value, bytes):
+            return value
+        try:
+            raw = decompress(value)
+        except (zlib.error, lzma.LZMAError):
+            return value
+        return raw.decode("utf-8") if base_type == "TEXT" else raw
+    return decode
+
+
+# Map of column name -> encoder for a table, from PRAGMA table_info rows
+def tableEncoders(table_info) -> Dict[str, Callable[[Any], Any]]:
+    encoders = {}
+    for col in table_info:
+        parsed = parseCodecType(col[2])
+        if parsed:
+            encoders[col[1]] = encoder(*parsed)
+    return encoders
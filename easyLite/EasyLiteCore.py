@@ -1,10 +1,20 @@
 # EasyLiteCore.py
 import os
 import sqlite3
-from .EasyLiteBuild import EasyLiteBuild
+import threading
+from .EasyLiteBuild import EasyLiteBuild, CHANGE_LOG_TABLE
 from .EasyLiteQuery import EasyLiteQuery
 from .EasyLiteRecord import EasyLiteRecord
 from .EasyLiteResult import EasyLiteResult
+from .EasyLiteWriter import EasyLiteWriter
+from .EasyLiteSummary import EasyLiteSummary
+from .EasyLiteBlob import EasyLiteBlob
+from .EasyLiteGuard import EasyLiteGuard
+from .EasyLiteMaintenance import EasyLiteMaintenance
+from .EasyLiteBulk import EasyLiteBulk
+from .EasyLiteCodec import parseCodecType
+from .EasyLiteServer import EasyLiteServer
+from .EasyLiteShards import EasyLiteShardRouter, EasyLiteShardBuild, EasyLiteShardRecord, EasyLiteShardQuery
 
 
 # Main class for database operations
@@ -16,12 +26,22 @@ class EasyLiteCore:
         self.db_path = None
         self.skip=object()
         self.null=object()
+        self._persist_path = None
+        self._autosave_stop = None
+        self._autosave_thread = None
+        self.in_memory = False
+        self._memory_uri = None
+        self.writer = None
+        self.router = None
+        self._guard = EasyLiteGuard()
+        self.maintenance = None
+        self._bulk = None
 
     # Connect to or create a SQLite database
-    def connect(self, db_path: str):
+    def connect(self, db_path: str, check_same_thread: bool = True):
         try:
             db_exists = os.path.exists(db_path)
-            self.connection = sqlite3.connect(db_path)
+            self.connection = sqlite3.connect(db_path, check_same_thread=check_same_thread)
             self.cursor = self.connection.cursor()
             self.db_path = db_path
             if db_exists:
@@ -32,58 +52,546 @@ class EasyLiteCore:
             print(f"[ERROR] Could not connect to the database: {e}")
         return self
 
+    # Spread tables over several database files by hash (or range) of a shard-key column
+    def connectSharded(self, db_paths: list, shard_key, ranges: list = None):
+        self.shards = []
+        for path in db_paths:
+            shard = EasyLiteCore().connect(path, check_same_thread=False)
+            shard.skip = self.skip
+            shard.null = self.null
+            self.shards.append(shard)
+        try:
+            self.router = EasyLiteShardRouter(self.shards, shard_key, ranges)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            return self
+        self.connection = self.shards[0].connection
+        self.cursor = self.connection.cursor()
+        self.db_path = db_paths[0]
+        print(f"[SUCCESS] Connected to {len(self.shards)} shards, shard key: {shard_key}.")
+        return self
+
+    # Load a database into RAM (optionally a named shared-cache database) and serve everything from memory
+    def connectInMemory(self, db_path: str = None, shared: str = None, autosave: float = None):
+        try:
+            uri = f"file:{shared}?mode=memory&cache=shared" if shared else ":memory:"
+            self.connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self.cursor = self.connection.cursor()
+            self.db_path = db_path
+            self._persist_path = db_path
+            self._memory_uri = uri
+            self.in_memory = True
+            self.cursor.execute("SELECT COUNT(*) FROM sqlite_master;")
+            is_empty = self.cursor.fetchone()[0] == 0
+            if db_path and os.path.exists(db_path) and is_empty:
+                src = sqlite3.connect(db_path)
+                try:
+                    src.backup(self.connection)
+                finally:
+                    src.close()
+                print(f"[SUCCESS] Database '{db_path}' has been loaded into memory.")
+            elif shared and not is_empty:
+                print(f"[SUCCESS] Attached to shared in-memory database '{shared}'.")
+            else:
+                print("[SUCCESS] A new in-memory database has been created.")
+            if autosave and db_path:
+                self._startAutosave(autosave)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Could not open the in-memory database: {e}")
+        return self
+
+    # Copy the in-memory database to disk with a paged online backup
+    def persist(self, db_path: str = None, pages: int = 256, sleep: float = 0.005):
+        target_path = db_path or self._persist_path
+        if not target_path:
+            print("[ERROR] No file to persist to. Pass db_path or connect with connectInMemory(db_path).")
+            return self
+        try:
+            target = sqlite3.connect(target_path)
+            try:
+                self.connection.backup(target, pages=pages, sleep=sleep)
+            finally:
+                target.close()
+            print(f"[SUCCESS] In-memory database persisted to '{target_path}'.")
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to persist database to '{target_path}': {e}")
+        return self
+
+    # Copy the whole database to another file with a paged online backup (progress(copied_pages, total_pages))
+    def snapshot(self, target_path: str, pages: int = 256, progress=None):
+        if self._bulkOpen("snapshot()"):
+            return self
+        try:
+            self.connection.commit()
+            target = sqlite3.connect(target_path)
+            try:
+                report = (lambda status, remaining, total: progress(total - remaining, total)) if progress else None
+                self.connection.backup(target, pages=pages, progress=report)
+            finally:
+                target.close()
+            print(f"[SUCCESS] Database snapshot written to '{target_path}'.")
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to write snapshot to '{target_path}': {e}")
+        return self
+
+    # Copy a table into another database file without rows leaving SQLite (ATTACH + INSERT ... SELECT)
+    def copyTable(self, table_name: str, target_path: str, target_table: str = None, columns: list = None,
+                  where: str = None, params: tuple = (), chunk_size: int = None, progress=None, replace: bool = False) -> int:
+        return self._copyTable(table_name, target_path, target_table, columns, where, params, chunk_size, progress, replace, export=True)
+
+    # Copy a table from another database file into this one (same options as copyTable)
+    def importTable(self, table_name: str, source_path: str, target_table: str = None, columns: list = None,
+                    where: str = None, params: tuple = (), chunk_size: int = None, progress=None, replace: bool = False) -> int:
+        return self._copyTable(table_name, source_path, target_table, columns, where, params, chunk_size, progress, replace, export=False)
+
+    # Internal method running the copy between main and the attached database; returns the copied row count
+    def _copyTable(self, table_name, other_path, target_table, columns, where, params, chunk_size, progress, replace, export):
+        target_table = target_table or table_name
+        src, dst = ("main", "easylite_copy") if export else ("easylite_copy", "main")
+        copied = 0
+        if self._bulkOpen("Copying tables"):
+            return copied
+        c = self.connection.cursor()
+        try:
+            self.connection.commit()
+            c.execute("ATTACH DATABASE ? AS easylite_copy;", (other_path,))
+        except sqlite3.Error as e:
+            print(f"[ERROR] Could not attach '{other_path}': {e}")
+            return 0
+        try:
+            c.execute(f"PRAGMA {src}.table_info({table_name});")
+            info = c.fetchall()
+            if not info:
+                raise sqlite3.OperationalError(f"no such table: {src}.{table_name}")
+            if columns:
+                missing = set(columns) - {col[1] for col in info}
+                if missing:
+                    raise sqlite3.OperationalError(f"no such column(s): {', '.join(sorted(missing))}")
+                info = [col for col in info if col[1] in columns]
+            col_defs = []
+            for col in info:
+                d = f"{col[1]} {col[2]}".rstrip()
+                if col[3]:
+                    d += " NOT NULL"
+                if col[4] is not None:
+                    d += f" DEFAULT {col[4]}"
+                col_defs.append(d)
+            pk = [col[1] for col in sorted(info, key=lambda col: col[5]) if col[5]]
+            if pk:
+                col_defs.append(f"PRIMARY KEY ({', '.join(pk)})")
+            c.execute(f"CREATE TABLE IF NOT EXISTS {dst}.{target_table} ({', '.join(col_defs)});")
+
+            names = ", ".join(col[1] for col in info)
+            verb = "INSERT OR REPLACE" if replace else "INSERT"
+            base = f"{verb} INTO {dst}.{target_table} ({names}) SELECT {names} FROM {src}.{table_name}"
+            filters = [f"({where})"] if where else []
+            c.execute(f"SELECT COUNT(*) FROM {src}.{table_name}" + (f" WHERE {where}" if where else ""), list(params))
+            total = c.fetchone()[0]
+            try:
+                c.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {src}.{table_name};")
+                low, high = c.fetchone()
+            except sqlite3.OperationalError:
+                # WITHOUT ROWID tables are copied in a single statement
+                low = high = None
+            if not chunk_size or low is None:
+                c.execute(base + (f" WHERE {' AND '.join(filters)}" if filters else ""), list(params))
+                copied = c.rowcount
+                self.connection.commit()
+                if progress:
+                    progress(copied, total)
+            else:
+                # Chunks are rowid ranges, committed one by one so neither journal grows with the table
+                for start in range(low, high + 1, chunk_size):
+                    chunk_where = " AND ".join(filters + ["rowid BETWEEN ? AND ?"])
+                    c.execute(f"{base} WHERE {chunk_where}", list(params) + [start, start + chunk_size - 1])
+                    copied += c.rowcount
+                    self.connection.commit()
+                    if progress:
+                        progress(copied, total)
+            direction = f"to '{other_path}'" if export else f"from '{other_path}'"
+            print(f"[SUCCESS] Copied {copied} rows of '{table_name}' {direction} as '{target_table}'.")
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            print(f"[ERROR] Failed to copy table '{table_name}': {e}")
+        finally:
+            try:
+                c.execute("DETACH DATABASE easylite_copy;")
+            except sqlite3.Error as e:
+                print(f"[ERROR] Could not detach '{other_path}': {e}")
+        return copied
+
+    # Internal method starting the periodic persist thread
+    def _startAutosave(self, interval: float):
+        self._autosave_stop = threading.Event()
+
+        def loop():
+            while not self._autosave_stop.wait(interval):
+                self.persist()
+
+        self._autosave_thread = threading.Thread(target=loop, name="easyLite-autosave", daemon=True)
+        self._autosave_thread.start()
+
+    # Internal method stopping the periodic persist thread and writing a final snapshot
+    def _stopAutosave(self):
+        if self._autosave_thread:
+            self._autosave_stop.set()
+            self._autosave_thread.join()
+            self._autosave_thread = None
+            self.persist()
+
+    # Route insertIn/updateIn/deleteIn writes through a background writer with group commits
+    def writeBehind(self, batch_size: int = 500, max_latency: float = 0.05, max_queue: int = 10000):
+        if self.writer:
+            return self
+        if self.in_memory and self._memory_uri == ":memory:":
+            # A private in-memory database is only reachable through the caller's own connection
+            print("[ERROR] Write-behind needs its own connection: use a file or connectInMemory(shared=...).")
+            return self
+        try:
+            target = self._memory_uri if self.in_memory else self.db_path
+            conn = sqlite3.connect(target, uri=self.in_memory, timeout=30, isolation_level=None, check_same_thread=False)
+            self.writer = EasyLiteWriter(conn, batch_size, max_latency, max_queue)
+            print(f"[SUCCESS] Write-behind enabled (batch {batch_size}, latency {max_latency}s, queue {max_queue}).")
+        except sqlite3.Error as e:
+            print(f"[ERROR] Could not start the write-behind queue: {e}")
+        return self
+
+    # Wait until every queued write-behind operation has been committed
+    def flush(self):
+        if self.writer:
+            self.writer.flush()
+        return self
+
+    # Start background maintenance (checkpoint, optimize/ANALYZE, incremental vacuum, integrity check)
+    def startMaintenance(self, interval: float = 3600, write_threshold: int = 100000, wal_threshold_mb: float = 64, **options):
+        if self.in_memory or not self.db_path:
+            print("[ERROR] Maintenance needs a file database.")
+            return self
+        self.stopMaintenance()
+        self.maintenance = EasyLiteMaintenance(self, interval, write_threshold, wal_threshold_mb, **options).start()
+        print(f"[SUCCESS] Maintenance scheduled (interval: {interval}s, write threshold: {write_threshold}, WAL limit: {wal_threshold_mb} MB).")
+        return self
+
+    # Run maintenance tasks now and return a report {task: {seconds, reclaimed_bytes, detail}}
+    def runMaintenance(self, *tasks: str, analyze: bool = False) -> dict:
+        if self.in_memory or not self.db_path:
+            print("[ERROR] Maintenance needs a file database.")
+            return {}
+        runner = self.maintenance or EasyLiteMaintenance(self)
+        return runner.run(list(tasks) or None, analyze=analyze)
+
+    # Stop background maintenance
+    def stopMaintenance(self):
+        if self.maintenance:
+            self.maintenance.stop()
+            self.maintenance = None
+        return self
+
+    # Switch the database to incremental auto-vacuum (rewrites the file once with VACUUM)
+    def enableIncrementalVacuum(self):
+        if self._bulkOpen("enableIncrementalVacuum()"):
+            return self
+        try:
+            self.connection.commit()
+            self.connection.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+            self.connection.execute("VACUUM;")
+            print("[SUCCESS] Incremental auto-vacuum enabled.")
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to enable incremental auto-vacuum: {e}")
+        return self
+
+    # Bulk-load session: use as "with db.bulkLoad(table) as bulk:"; commits or rolls back as a whole
+    def bulkLoad(self, table_name: str, drop_indexes: bool = True, relax_journal: bool = True) -> EasyLiteBulk:
+        return EasyLiteBulk(self, table_name, drop_indexes, relax_journal)
+
+    # Internal method committing record writes (deferred while a bulk-load session is open)
+    def _commit(self):
+        if not self._bulk:
+            self.connection.commit()
+
+    # Internal method undoing a failed write (an open bulk-load session is marked failed and rolls back as a whole)
+    def _rollback(self, error: Exception = None):
+        if not self._bulk:
+            self.connection.rollback()
+        elif error is not None:
+            self._bulk.errors.append(error)
+
+    # Internal method refusing operations that need their own transaction while a bulk-load session is open
+    def _bulkOpen(self, action: str) -> bool:
+        if self._bulk:
+            print(f"[ERROR] {action} is not available inside the bulk-load session on '{self._bulk.table_name}'.")
+            return True
+        return False
+
     # Returns a builder for creating a new table
     def newTable(self, table_name: str) -> EasyLiteBuild:
+        if self.router:
+            return EasyLiteShardBuild(self.router, [EasyLiteBuild(s.connection, table_name, mode="newtable") for s in self.shards])
         return EasyLiteBuild(self.connection, table_name, mode="newtable")
 
     # Returns a builder for adding columns to an existing table
     def addToTable(self, table_name: str) -> EasyLiteBuild:
+        if self.router:
+            return EasyLiteShardBuild(self.router, [EasyLiteBuild(s.connection, table_name, mode="addcolumns") for s in self.shards])
         return EasyLiteBuild(self.connection, table_name, mode="addcolumns")
 
     # Returns a builder for modifying an existing table
     def modTable(self, table_name: str) -> EasyLiteBuild:
+        if self.router:
+            return EasyLiteShardBuild(self.router, [EasyLiteBuild(s.connection, table_name, mode="modtable") for s in self.shards])
         return EasyLiteBuild(self.connection, table_name, mode="modtable")
 
     # Insert resord(s)
     def insertIn(self, table_name: str):
+        if self.router:
+            return EasyLiteShardRecord(self.router, table_name, mode="insert")
         return EasyLiteRecord(self, table_name, mode="insert")
 
     # Update resord(s)
     def updateIn(self, table_name: str):
+        if self.router:
+            return EasyLiteShardRecord(self.router, table_name, mode="update")
         return EasyLiteRecord(self, table_name, mode="update")
 
     # Delete resord(s)
     def deleteIn(self, table_name: str):
+        if self.router:
+            return EasyLiteShardRecord(self.router, table_name, mode="delete")
         return EasyLiteRecord(self, table_name, mode="delete")
 
+    # Serve read-only SELECTs over HTTP: GET /<table>?fields=a,b&<column>=<value>&sort=col&desc=1&limit=n&after=<key>
+    def serve(self, host: str = "127.0.0.1", port: int = 8080, pool_size: int = 4, tables: list = None,
+              max_limit: int = 1000, cache_size: int = 256, block: bool = False):
+        if self.router:
+            print("[ERROR] serve() is not available on sharded connections.")
+            return None
+        if self._bulkOpen("serve()"):
+            return None
+        if self.in_memory and "cache=shared" not in self._memory_uri:
+            print("[ERROR] serve() needs a database file or a shared in-memory database (connectInMemory(shared=...)).")
+            return None
+        uri = self._memory_uri if self.in_memory else f"file:{os.path.abspath(self.db_path)}?mode=ro"
+        try:
+            self.connection.commit()
+            server = EasyLiteServer(uri, host, port, pool_size, tables, max_limit, cache_size)
+        except (sqlite3.Error, OSError) as e:
+            print(f"[ERROR] Could not start the HTTP service: {e}")
+            return None
+        if block:
+            server.serveForever()
+            return server
+        return server.start()
+
     # Builds a SELECT query
     def select(self, table_name: str) -> EasyLiteQuery:
-        return EasyLiteQuery(self.connection, table_name)
+        if self.router:
+            return EasyLiteShardQuery(self.router, table_name, guard=self._guard)
+        return EasyLiteQuery(self.connection, table_name, guard=self._guard)
+
+    # Default time (seconds) and VM-step budget for fetch() and executeCustomQuery() on this connection
+    def setTimeout(self, seconds: float = None, max_steps: int = None):
+        self._guard.timeout = seconds
+        self._guard.max_steps = max_steps
+        return self
+
+    # Cancel the query currently running on this connection (call it from another thread)
+    def cancel(self):
+        self._guard.cancel()
+        return self
 
     # Execute a custom SQL query
-    def executeCustomQuery(self, sql: str, params: tuple = ()) -> EasyLiteResult:
+    def executeCustomQuery(self, sql: str, params: tuple = (), timeout: float = None, max_steps: int = None) -> EasyLiteResult:
+        if self.router:
+            parts = [s.executeCustomQuery(sql, params) for s in self.shards]
+            return EasyLiteResult([r for p in parts for r in p.rows()], parts[0].columns())
         try:
             c = self.connection.cursor()
-            c.execute(sql, params)
             rows = []
             col_names = []
-            try:
-                rows = c.fetchall()
-                col_names = [desc[0] for desc in c.description]
-            except sqlite3.ProgrammingError:
-                pass
-            self.connection.commit()
+            with self._guard.budget(self.connection, timeout, max_steps):
+                c.execute(sql, params)
+                try:
+                    rows = c.fetchall()
+                    col_names = [desc[0] for desc in c.description]
+                except (sqlite3.ProgrammingError, TypeError):
+                    pass
+            self._commit()
             return EasyLiteResult(rows, col_names)
         except sqlite3.Error as e:
             print(f"[ERROR] Custom query failed: {e}")
             return EasyLiteResult([], [])
 
+    # Open a file-like handle on one BLOB cell (incremental I/O, nothing is loaded up front)
+    def openBlob(self, table_name: str, column: str, rowid: int, readonly: bool = True) -> EasyLiteBlob:
+        if self._blobUnavailable(table_name, column):
+            return None
+        try:
+            return EasyLiteBlob(self.connection, table_name, column, rowid, readonly=readonly, commit=self._commit)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Could not open blob {table_name}.{column} (rowid {rowid}): {e}")
+            return None
+
+    # Stream a file (or any readable object) into a BLOB cell in chunks
+    def storeBlob(self, table_name: str, column: str, rowid: int, source, size: int = None, chunk_size: int = 1 << 20):
+        if self._blobUnavailable(table_name, column):
+            return self
+        try:
+            if isinstance(source, (str, os.PathLike)):
+                size = os.path.getsize(source) if size is None else size
+                with open(source, "rb") as f:
+                    return self.storeBlob(table_name, column, rowid, f, size, chunk_size)
+            if size is None and not hasattr(source, "seek"):
+                print(f"[ERROR] Cannot store into {table_name}.{column}: pass size= for a stream that cannot seek.")
+                return self
+            if size is None:
+                start = source.tell()
+                size = source.seek(0, os.SEEK_END) - start
+                source.seek(start)
+            c = self.connection.cursor()
+            c.execute(f"UPDATE {table_name} SET {column} = zeroblob(?) WHERE rowid = ?;", (size, rowid))
+            if c.rowcount == 0:
+                self._rollback()
+                print(f"[ERROR] No row with rowid {rowid} in '{table_name}'.")
+                return self
+            # Reuse one buffer when the source supports readinto(), otherwise fall back to read()
+            readinto = getattr(source, "readinto", None)
+            buf = bytearray(chunk_size) if readinto else None
+            with EasyLiteBlob(self.connection, table_name, column, rowid, readonly=False, commit=self._commit) as blob:
+                remaining = size
+                while remaining > 0:
+                    want = min(chunk_size, remaining)
+                    if readinto:
+                        data = memoryview(buf)[:readinto(memoryview(buf)[:want]) or 0]
+                    else:
+                        data = source.read(want)
+                    if not data:
+                        break
+                    blob.write(data)
+                    remaining -= len(data)
+            print(f"[SUCCESS] Stored {size - remaining} bytes into {table_name}.{column} (rowid {rowid}).")
+        except (sqlite3.Error, OSError) as e:
+            self._rollback(e)
+            print(f"[ERROR] Failed to store blob into {table_name}.{column} (rowid {rowid}): {e}")
+        return self
+
+    # Stream a BLOB cell out to a file (or any writable object) in chunks
+    def loadBlob(self, table_name: str, column: str, rowid: int, target, chunk_size: int = 1 << 20):
+        if self._blobUnavailable(table_name, column):
+            return self
+        try:
+            if isinstance(target, (str, os.PathLike)):
+                with open(target, "wb") as f:
+                    return self.loadBlob(table_name, column, rowid, f, chunk_size)
+            total = 0
+            buf = bytearray(chunk_size)
+            with EasyLiteBlob(self.connection, table_name, column, rowid) as blob:
+                while True:
+                    n = blob.readinto(buf)
+                    if not n:
+                        break
+                    target.write(memoryview(buf)[:n])
+                    total += n
+            print(f"[SUCCESS] Loaded {total} bytes from {table_name}.{column} (rowid {rowid}).")
+        except (sqlite3.Error, OSError) as e:
+            print(f"[ERROR] Failed to load blob from {table_name}.{column} (rowid {rowid}): {e}")
+        return self
+
+    # Internal method refusing incremental I/O on compressed columns or without Connection.blobopen (Python < 3.11)
+    def _blobUnavailable(self, table_name: str, column: str) -> bool:
+        if not hasattr(sqlite3.Connection, "blobopen"):
+            print("[ERROR] Streaming BLOB I/O needs Python 3.11+ (sqlite3.Connection.blobopen); read whole values with select() instead.")
+            return True
+        c = self.connection.cursor()
+        c.execute(f"PRAGMA table_info({table_name});")
+        for col in c.fetchall():
+            if col[1] == column and parseCodecType(col[2]):
+                print(f"[ERROR] Column '{column}' is compressed and cannot be streamed; use a plain blobCol.")
+                return True
+        return False
+
+    # Latest state of every row changed after a watermark (deleted rows have NULL data)
+    def changesSince(self, table_name: str, since: int = 0) -> EasyLiteResult:
+        try:
+            c = self.connection.cursor()
+            sql, params = self._changesSql(table_name, since)
+            c.execute(sql, params)
+            rows = c.fetchall()
+            cols = [d[0] for d in c.description]
+            print(f"[SUCCESS] {len(rows)} changed rows found in '{table_name}' since {since}.")
+            return EasyLiteResult(rows, cols, EasyLiteQuery(self.connection, table_name)._decoders(cols))
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to read changes of '{table_name}': {e}")
+            return EasyLiteResult([], [])
+
+    # Same as changesSince but yields rows one at a time
+    def streamChanges(self, table_name: str, since: int = 0):
+        try:
+            c = self.connection.cursor()
+            sql, params = self._changesSql(table_name, since)
+            c.execute(sql, params)
+            dec = EasyLiteQuery(self.connection, table_name)._decoders([d[0] for d in c.description])
+            for row in c:
+                yield tuple(dec[i](v) if i in dec else v for i, v in enumerate(row)) if dec else row
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to stream changes of '{table_name}': {e}")
+
+    # Highest sequence number logged for a table (use it as the next watermark)
+    def changeWatermark(self, table_name: str) -> int:
+        try:
+            c = self.connection.cursor()
+            c.execute(f"SELECT COALESCE(MAX(seq), 0) FROM {CHANGE_LOG_TABLE} WHERE table_name = ?;", (table_name,))
+            return c.fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to read change watermark of '{table_name}': {e}")
+            return 0
+
+    # Prune change-log entries already consumed up to a watermark
+    def compactChanges(self, table_name: str, upto: int) -> int:
+        try:
+            c = self.connection.cursor()
+            c.execute(f"DELETE FROM {CHANGE_LOG_TABLE} WHERE table_name = ? AND seq <= ?;", (table_name, upto))
+            self._commit()
+            print(f"[SUCCESS] Pruned {c.rowcount} change-log entries of '{table_name}' up to {upto}.")
+            return c.rowcount
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to compact changes of '{table_name}': {e}")
+            return 0
+
+    # Internal method building the change query (one row per changed rowid, latest operation wins)
+    def _changesSql(self, table_name: str, since: int):
+        log = CHANGE_LOG_TABLE
+        sql = (f"SELECT ch.seq AS _seq, ch.op AS _op, ch.row_id AS _rowid, t.* "
+               f"FROM {log} ch LEFT JOIN {table_name} t ON t.rowid = ch.row_id AND ch.op != 'D' "
+               f"WHERE ch.table_name = ? AND ch.seq > ? "
+               f"AND ch.seq = (SELECT MAX(seq) FROM {log} WHERE table_name = ch.table_name AND row_id = ch.row_id) "
+               f"ORDER BY ch.seq;")
+        return sql, (table_name, since)
+
+    # Recompute a summary table from its source query
+    def refreshSummary(self, name: str):
+        if self._bulkOpen("refreshSummary()"):
+            return self
+        EasyLiteSummary(self.connection, name).refresh()
+        return self
+
+    # Drop a summary table and its maintenance triggers
+    def dropSummary(self, name: str):
+        if self._bulkOpen("dropSummary()"):
+            return self
+        EasyLiteSummary(self.connection, name).drop()
+        return self
+
     # Drop an existing table
     def dropTable(self, table_name: str):
+        if self.router:
+            for s in self.shards:
+                s.dropTable(table_name)
+            self.router.reset()
+            return
         q = f"DROP TABLE IF EXISTS {table_name};"
         try:
             self.cursor.execute(q)
-            self.connection.commit()
+            self._commit()
             print(f"[SUCCESS] Successfully dropped table '{table_name}' (if it existed).")
         except sqlite3.Error as e:
             print(f"[ERROR] Failed to drop table '{table_name}': {e}")
@@ -136,7 +644,18 @@ class EasyLiteCore:
 
     # Close the database connection
     def close(self):
+        if self.router:
+            for s in self.shards:
+                s.close()
+            self.router = None
+            self.connection = None
+            return
         if self.connection:
+            if self.writer:
+                self.writer.shutdown()
+                self.writer = None
+            self.stopMaintenance()
+            self._stopAutosave()
             try:
                 self.connection.close()
                 self.connection = None
@@ -0,0 +1,93 @@
+# EasyLiteGuard.py
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+# Raised when a statement is stopped before completion
+class EasyLiteInterrupted(Exception):
+    pass
+
+
+# Raised when a statement exceeds its time or VM-step budget
+class EasyLiteTimeout(EasyLiteInterrupted):
+    pass
+
+
+# Raised when a statement is cancelled from another thread
+class EasyLiteCancelled(EasyLiteInterrupted):
+    pass
+
+
+# Enforces time/VM-step budgets through the progress handler and allows cancellation
+class EasyLiteGuard:
+    # Constructor (granularity is the number of VM steps between two budget checks)
+    def __init__(self, timeout: float = None, max_steps: int = None, granularity: int = 1000):
+        self.timeout = timeout
+        self.max_steps = max_steps
+        self.granularity = granularity
+        self._lock = threading.Lock()
+        # Every query gets a generation number when its budget starts; cancel() marks the queries
+        # started so far, so a cancellation never carries over to a query started after it
+        self._generation = 0
+        self._cancelled_upto = 0
+        self._running = {}
+
+    # Stop the queries running under this guard (safe to call from any thread); when nothing is
+    # running the call has no effect
+    def cancel(self):
+        with self._lock:
+            self._cancelled_upto = self._generation
+            targets = list(self._running.values())
+        for connection in targets:
+            connection.interrupt()
+
+    # Run a block under a budget; per-call values override the guard defaults. Passing the same
+    # state dict to several blocks (e.g. the chunks of a stream) makes them share one budget.
+    @contextmanager
+    def budget(self, connection: sqlite3.Connection, timeout: float = None, max_steps: int = None, state: dict = None):
+        timeout = self.timeout if timeout is None else timeout
+        max_steps = self.max_steps if max_steps is None else max_steps
+        if state is None:
+            state = {}
+        # Budgets below the granularity are checked at their own size so they still apply
+        interval = max(1, min(self.granularity, max_steps)) if max_steps is not None else self.granularity
+        token = object()
+        with self._lock:
+            if not state:
+                self._generation += 1
+                state.update(deadline=time.monotonic() + timeout if timeout is not None else None, steps=0,
+                             reason=None, generation=self._generation)
+            cancelled = state["generation"] <= self._cancelled_upto
+            if not cancelled:
+                self._running[token] = connection
+        if cancelled:
+            raise EasyLiteCancelled("Query cancelled.")
+        deadline = state["deadline"]
+
+        def handler():
+            state["steps"] += interval
+            if state["generation"] <= self._cancelled_upto:
+                return 1
+            if deadline is not None and time.monotonic() > deadline:
+                state["reason"] = f"time budget of {timeout}s exceeded"
+                return 1
+            if max_steps is not None and state["steps"] > max_steps:
+                state["reason"] = f"budget of {max_steps} VM steps exceeded"
+                return 1
+            return 0
+
+        connection.set_progress_handler(handler, interval)
+        try:
+            yield
+        except sqlite3.OperationalError as e:
+            if state["generation"] <= self._cancelled_upto:
+                raise EasyLiteCancelled("Query cancelled.") from e
+            if state["reason"]:
+                raise EasyLiteTimeout(f"Query stopped: {state['reason']}.") from e
+            raise
+        finally:
+            connection.set_progress_handler(None, 0)
+            with self._lock:
+                del self._running[token]
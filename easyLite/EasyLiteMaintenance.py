@@ -0,0 +1,164 @@
+# EasyLiteMaintenance.py
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, List
+
+# Tasks run by default, in this order
+DEFAULT_TASKS = ["checkpoint", "optimize", "vacuum", "integrity"]
+
+
+# Runs database housekeeping on a background connection, on a schedule or after heavy writes
+class EasyLiteMaintenance:
+    # Constructor
+    def __init__(self, core, interval: float = 3600, write_threshold: int = 100000, wal_threshold_mb: float = 64,
+                 vacuum_pages: int = 1000, tasks: List[str] = None, poll: float = 5.0):
+        self.core = core
+        self.interval = interval
+        self.write_threshold = write_threshold
+        self.wal_threshold = int(wal_threshold_mb * 1024 * 1024)
+        self.vacuum_pages = vacuum_pages
+        self.tasks = tasks or list(DEFAULT_TASKS)
+        self.poll = poll
+        self.last_report: Dict[str, dict] = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_run = time.monotonic()
+        self._writes_seen = self._totalChanges()
+        # WAL-triggered checkpoints back off while readers keep the WAL busy
+        self._wal_busy = False
+        self._wal_delay = poll
+        self._wal_next = 0.0
+
+    # Start the background scheduler
+    def start(self):
+        if self._thread:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="easyLite-maintenance", daemon=True)
+        self._thread.start()
+        return self
+
+    # Stop the background scheduler
+    def stop(self):
+        if self._thread:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    # Run the given tasks now on a dedicated connection and return a report per task (a full run also
+    # restarts the interval and write counters)
+    def run(self, tasks: List[str] = None, analyze: bool = False) -> Dict[str, dict]:
+        report = {}
+        try:
+            conn = sqlite3.connect(self.core.db_path, timeout=30)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Maintenance could not open '{self.core.db_path}': {e}")
+            return report
+        try:
+            for task in tasks or self.tasks:
+                handler = getattr(self, f"_{task}", None)
+                if handler is None:
+                    print(f"[ERROR] Unknown maintenance task '{task}'.")
+                    continue
+                before = self._size(conn)
+                start = time.perf_counter()
+                try:
+                    detail = handler(conn, analyze) if task == "optimize" else handler(conn)
+                except sqlite3.Error as e:
+                    detail = f"failed: {e}"
+                elapsed = time.perf_counter() - start
+                reclaimed = max(0, before - self._size(conn))
+                report[task] = {"seconds": round(elapsed, 4), "reclaimed_bytes": reclaimed, "detail": detail}
+                print(f"[SUCCESS] Maintenance '{task}': {detail} ({elapsed:.3f}s, {reclaimed} bytes reclaimed).")
+        finally:
+            conn.close()
+        if tasks is None:
+            self._last_run = time.monotonic()
+            self._writes_seen = self._totalChanges()
+        self.last_report = report
+        return report
+
+    # Internal scheduler loop
+    def _loop(self):
+        while not self._stop.wait(self.poll):
+            try:
+                total = self._totalChanges()
+                # The write-behind connection may have been replaced, restarting its counter
+                self._writes_seen = min(self._writes_seen, total)
+                due = self.interval is not None and time.monotonic() - self._last_run >= self.interval
+                heavy = self.write_threshold is not None and total - self._writes_seen >= self.write_threshold
+                if due or heavy:
+                    self.run(analyze=heavy)
+                elif self._walSize() >= self.wal_threshold and time.monotonic() >= self._wal_next:
+                    # A large WAL only needs a checkpoint, not the whole task list
+                    self.run(["checkpoint"])
+                    self._walBackoff()
+            except Exception as e:
+                print(f"[ERROR] Maintenance run failed: {e}")
+
+    # Internal task: checkpoint the WAL (truncating it once it is above the threshold)
+    def _checkpoint(self, conn):
+        mode = conn.execute("PRAGMA journal_mode;").fetchone()[0]
+        if mode.lower() != "wal":
+            return f"skipped (journal_mode is {mode})"
+        wal = self._walSize()
+        kind = "TRUNCATE" if wal >= self.wal_threshold else "PASSIVE"
+        busy, log, done = conn.execute(f"PRAGMA wal_checkpoint({kind});").fetchone()
+        self._wal_busy = bool(busy)
+        return f"{kind.lower()} checkpoint, {done}/{log} frames{' (busy)' if busy else ''}"
+
+    # Internal method delaying the next WAL-triggered checkpoint while it keeps failing (doubling up to the interval)
+    def _walBackoff(self):
+        if self._wal_busy or self._walSize() >= self.wal_threshold:
+            self._wal_delay = min(self._wal_delay * 2, self.interval or 64 * self.poll)
+        else:
+            self._wal_delay = self.poll
+        self._wal_next = time.monotonic() + self._wal_delay
+
+    # Internal task: refresh planner statistics
+    def _optimize(self, conn, analyze: bool = False):
+        if analyze:
+            conn.execute("ANALYZE;")
+            return "full ANALYZE after heavy writes"
+        conn.execute("PRAGMA optimize;")
+        return "PRAGMA optimize"
+
+    # Internal task: return free pages to the file system
+    def _vacuum(self, conn):
+        if conn.execute("PRAGMA auto_vacuum;").fetchone()[0] != 2:
+            return "skipped (auto_vacuum is not INCREMENTAL, see enableIncrementalVacuum())"
+        free = conn.execute("PRAGMA freelist_count;").fetchone()[0]
+        # executescript steps the pragma to completion (execute() stops after the first freed page)
+        conn.executescript(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)});")
+        left = conn.execute("PRAGMA freelist_count;").fetchone()[0]
+        return f"{free - left} pages freed, {left} left"
+
+    # Internal task: quick integrity check
+    def _integrity(self, conn):
+        rows = conn.execute("PRAGMA quick_check;").fetchall()
+        return "ok" if rows == [("ok",)] else "; ".join(r[0] for r in rows[:5])
+
+    # Internal method: database file plus WAL size in bytes
+    def _size(self, conn) -> int:
+        pages = conn.execute("PRAGMA page_count;").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size;").fetchone()[0]
+        return pages * page_size + self._walSize()
+
+    # Internal method: current WAL file size
+    def _walSize(self) -> int:
+        wal = f"{self.core.db_path}-wal"
+        return os.path.getsize(wal) if os.path.exists(wal) else 0
+
+    # Internal method: writes performed so far through the main and write-behind connections
+    def _totalChanges(self) -> int:
+        total = 0
+        writer = self.core.writer
+        for conn in (self.core.connection, writer.connection if writer else None):
+            try:
+                total += conn.total_changes if conn else 0
+            except sqlite3.ProgrammingError:
+                # Closed while the database is shutting down
+                pass
+        return total
@@ -1,12 +1,109 @@
 # EasyLiteQuery.py
+import os
+import re
+import csv
+import json
+import heapq
+import queue
 import sqlite3
-from typing import List, Tuple, Any
+import multiprocessing
+from typing import List, Tuple, Any, Iterator
 from .EasyLiteResult import EasyLiteResult
+from .EasyLiteArrays import _numpyDtype, _fillArrays
+from .EasyLiteSummary import EasyLiteSummary
+from .EasyLiteCodec import parseCodecType, decoder
+from .EasyLiteGuard import EasyLiteGuard
+
+
+# Rows per chunk sent back by a partition worker, and chunks a worker may queue ahead of the reader
+PARTITION_CHUNK = 1000
+PARTITION_QUEUE = 4
+
+
+# Worker executed in a separate process: scans rowid ranges with its own read-only connection and sends
+# the rows back in chunks through a bounded queue as (tag, kind, payload) messages
+def _scanPartitions(db_path: str, jobs: list, timeout: float, max_steps: int, out, tag: int):
+    conn = None
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        guard = EasyLiteGuard(timeout, max_steps)
+        for sql, params in jobs:
+            # Each range has its own budget, shared by all of its chunks
+            state = {}
+            c = conn.cursor()
+            with guard.budget(conn, state=state):
+                c.execute(sql, params)
+            out.put((tag, "cols", [d[0] for d in c.description] if c.description else []))
+            while True:
+                with guard.budget(conn, state=state):
+                    chunk = c.fetchmany(PARTITION_CHUNK)
+                if not chunk:
+                    break
+                out.put((tag, "rows", chunk))
+        out.put((tag, "done", None))
+    except Exception as e:
+        out.put((tag, "error", e))
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+# Internal helper reading the next worker message, failing instead of waiting forever if the workers died
+def _nextMessage(out, procs: list):
+    while True:
+        try:
+            return out.get(timeout=0.5)
+        except queue.Empty:
+            if not any(p.is_alive() for p in procs):
+                try:
+                    return out.get(timeout=0.5)
+                except queue.Empty:
+                    raise sqlite3.OperationalError("a parallel scan worker exited without finishing its partition")
+
+
+# Internal helper yielding the rows a group of partition workers put on one queue, until all of them are done
+def _drainPartitions(out, procs: list):
+    live = len(procs)
+    while live:
+        _, kind, payload = _nextMessage(out, procs)
+        if kind == "rows":
+            yield from payload
+        elif kind == "done":
+            live -= 1
+        elif kind == "error":
+            raise payload
+
+
+# ASCII-only case folding, as done by SQLite's NOCASE collation
+_NOCASE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+# Python-side folding for the built-in collations (custom collations cannot be reproduced)
+_COLLATIONS = {
+    "BINARY": lambda s: s,
+    "NOCASE": lambda s: s.translate(_NOCASE),
+    "RTRIM": lambda s: s.rstrip(" "),
+}
+
+
+# Sort key following SQLite's ORDER BY rules: NULL < numbers < text (collated) < BLOB
+def _sqliteSortKey(collation: str = "BINARY"):
+    fold = _COLLATIONS[collation]
+
+    def key(value):
+        if value is None:
+            return (0, 0)
+        if isinstance(value, (int, float)):
+            return (1, value)
+        if isinstance(value, str):
+            return (2, fold(value))
+        return (3, bytes(value))
+    return key
+
 
 # Class for building SELECT queries
 class EasyLiteQuery:
     # Constructor
-    def __init__(self, connection: sqlite3.Connection, table_name: str):
+    def __init__(self, connection: sqlite3.Connection, table_name: str, guard: EasyLiteGuard = None):
         self.connection = connection
         self.table_name = table_name
         self._fields = ["*"]
@@ -16,6 +113,11 @@ class EasyLiteQuery:
         self._limit_count = None
         self._params = []
         self._joins = []
+        self._parallel = None
+        self._search_fields = []
+        self._guard = guard or EasyLiteGuard()
+        self._budget = (None, None)
+        self._includes = []
 
     # Select specific fields
     def fields(self, *fields: str):
@@ -40,6 +142,29 @@ class EasyLiteQuery:
         self._joins.append((other_table, on_condition, join_type.upper()))
         return self
 
+    # Full-text search through the table's FTS5 index, ranked by bm25 (lower rank is better)
+    def match(self, query: str, snippet: str = None, tokens: int = 10, marks: Tuple[str, str] = ("[", "]")):
+        fts = f"{self.table_name}_fts"
+        self._joins.append((fts, f"{fts}.rowid = {self.table_name}.rowid", "INNER"))
+        self._where_clauses.append(f"{fts} MATCH ?")
+        self._params.append(query)
+        self._search_fields = [f"bm25({fts}) AS rank"]
+        if snippet:
+            try:
+                c = self.connection.cursor()
+                c.execute(f"PRAGMA table_info({fts});")
+                fts_cols = [col[1] for col in c.fetchall()]
+                idx = fts_cols.index(snippet)
+                self._search_fields.append(f"snippet({fts}, {idx}, '{marks[0]}', '{marks[1]}', '...', {int(tokens)}) AS snippet")
+            except (sqlite3.Error, ValueError):
+                print(f"[ERROR] Column '{snippet}' is not part of the full-text index '{fts}'.")
+        return self
+
+    # Eager-load rows of a related table (found through FK metadata) with batched IN queries
+    def include(self, related_table: str, name: str = None):
+        self._includes.append((related_table, name or related_table))
+        return self
+
     # Add a GROUP BY clause
     def groupBy(self, *columns: str):
         for c in columns:
@@ -57,23 +182,453 @@ class EasyLiteQuery:
         self._limit_count = count
         return self
 
+    # Stop fetch() with EasyLiteTimeout after a time (seconds) and/or VM-step budget
+    def timeout(self, seconds: float = None, max_steps: int = None):
+        self._budget = (seconds, max_steps)
+        return self
+
+    # Run the query on rowid partitions in a process pool
+    def parallel(self, workers: int = None, partitions: int = None):
+        workers = workers or os.cpu_count() or 1
+        self._parallel = (workers, partitions or workers)
+        return self
+
+    # Execute and yield rows one at a time instead of building a result
+    def stream(self) -> Iterator[Tuple[Any]]:
+        try:
+            cols, rows = self._open_stream()
+            yield from rows
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to stream SELECT query on '{self.table_name}': {e}")
+
+    # Stream the query straight into a CSV file
+    def exportCSV(self, csv_filename: str):
+        try:
+            cols, rows = self._open_stream()
+            with open(csv_filename, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(cols)
+                writer.writerows(rows)
+            print(f"[SUCCESS] CSV file has been successfully exported to '{csv_filename}'.")
+        except (sqlite3.Error, OSError) as e:
+            print(f"[ERROR] Failed to export CSV file '{csv_filename}': {e}")
+
+    # Stream the query straight into a JSON file
+    def exportJSON(self, json_filename: str):
+        try:
+            cols, rows = self._open_stream()
+            with open(json_filename, "w", encoding="utf-8") as f:
+                f.write("[")
+                for i, row in enumerate(rows):
+                    if i:
+                        f.write(", ")
+                    f.write(json.dumps(dict(zip(cols, row))))
+                f.write("]")
+            print(f"[SUCCESS] JSON file has been successfully exported to '{json_filename}'.")
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            print(f"[ERROR] Failed to export JSON file '{json_filename}': {e}")
+
     # Execute and return results
     def fetch(self) -> EasyLiteResult:
+        if self._parallel:
+            try:
+                merged = self._run_partitions()
+                if merged:
+                    cols, rows = merged
+                    print('[SUCCESS] Parallel query executed, EasyLiteResult object returned.')
+                    return self._load_related(EasyLiteResult(list(rows), cols, self._decoders(cols)))
+            except sqlite3.Error as e:
+                print(f"[ERROR] Failed to execute parallel SELECT query on '{self.table_name}': {e}")
+                return EasyLiteResult([], [])
         sql, params = self._build_sql()
         try:
-            c = self.connection.cursor()
-            c.execute(sql, params)
-            rows = c.fetchall()
-            cols = [d[0] for d in c.description] if c.description else []
+            cols, rows = self._run(sql, params)
             print('[SUCCESS] Query executed, EasyLiteResult object returned.')
-            return EasyLiteResult(rows, cols)
+            return self._load_related(EasyLiteResult(rows, cols, self._decoders(cols)))
         except sqlite3.Error as e:
             print(f"[ERROR] Failed to execute SELECT query on '{self.table_name}': {e}")
             return EasyLiteResult([], [])
 
+    # Execute and return a dict of NumPy masked arrays (one per column), filled in chunks from the cursor
+    def fetchArrays(self, chunk_size: int = 10000, dtypes: dict = None) -> dict:
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            print("[ERROR] fetchArrays() requires NumPy. Install it with 'pip install numpy'.")
+            return {}
+        try:
+            # A single statement: arrays start at one chunk (or the limit) and grow as chunks arrive
+            capacity = chunk_size if self._limit_count is None else min(chunk_size, self._limit_count)
+            declared = self._declared_types()
+            cols, chunks = self._array_chunks(chunk_size)
+            overrides = dtypes or {}
+            col_dtypes = [overrides.get(col, _numpyDtype(declared.get(col, ""))) for col in cols]
+            arrays = _fillArrays(chunks, capacity, cols, col_dtypes)
+            total = len(next(iter(arrays.values()))) if arrays else 0
+            print(f'[SUCCESS] Query executed, {total} rows loaded into {len(cols)} arrays.')
+            return arrays
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            print(f"[ERROR] Failed to fetch arrays from '{self.table_name}': {e}")
+            return {}
+
+    # Count matching rows (dict of counts per group when groupBy is set)
+    def count(self):
+        # Selected fields can change the row count (e.g. DISTINCT), so the query itself is counted
+        if self._fields != ["*"] and not self._group_by_columns:
+            try:
+                return self._count_rows()
+            except sqlite3.Error as e:
+                print(f"[ERROR] Failed to execute COUNT(*) on '{self.table_name}': {e}")
+                return 0
+        result = self._aggregate("COUNT(*)", None)
+        return 0 if result is None else result
+
+    # Check whether at least one row matches
+    def exists(self) -> bool:
+        # The EXISTS subquery drops ORDER BY and LIMIT; only LIMIT 0 can change the answer
+        if self._limit_count == 0:
+            return False
+        sql, params = self._build_sql(fields=["1"], order=False)
+        try:
+            return bool(self._run(f"SELECT EXISTS({sql});", params)[1][0][0])
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to run EXISTS query on '{self.table_name}': {e}")
+            return False
+
+    # Sum of a column (dict per group when groupBy is set)
+    def sum(self, column: str):
+        return self._aggregate("SUM", column)
+
+    # Average of a column (dict per group when groupBy is set)
+    def avg(self, column: str):
+        return self._aggregate("AVG", column)
+
+    # Minimum of a column (dict per group when groupBy is set)
+    def min(self, column: str):
+        return self._aggregate("MIN", column)
+
+    # Maximum of a column (dict per group when groupBy is set)
+    def max(self, column: str):
+        return self._aggregate("MAX", column)
+
+    # Run several aggregate expressions at once, e.g. aggregate("COUNT(*) AS n", "AVG(age) AS avg_age")
+    def aggregate(self, *expressions: str) -> EasyLiteResult:
+        sql, params = self._build_sql(fields=self._group_by_columns + list(expressions))
+        try:
+            cols, rows = self._run(sql, params)
+            print('[SUCCESS] Aggregate query executed, EasyLiteResult object returned.')
+            return EasyLiteResult(rows, cols)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to execute aggregate query on '{self.table_name}': {e}")
+            return EasyLiteResult([], [])
+
+    # Declare a trigger-maintained summary table from this grouping, e.g. summaryTable("sales_by_region", n="COUNT(*)", total="SUM(amount)")
+    def summaryTable(self, name: str, **aggregates: str) -> EasyLiteSummary:
+        return EasyLiteSummary(self.connection, name).create(self, aggregates)
+
+    # Internal method running a single aggregate as one SQL statement
+    def _aggregate(self, func: str, column: str):
+        expr = func if column is None else f"{func}({column})"
+        try:
+            if self._group_by_columns:
+                sql, params = self._build_sql(fields=self._group_by_columns + [expr])
+                n = len(self._group_by_columns)
+                return {(r[0] if n == 1 else tuple(r[:n])): r[n] for r in self._run(sql, params)[1]}
+            if self._limit_count is not None:
+                inner_fields = ["1"] if column is None else [f"{column} AS _agg_value"]
+                inner, params = self._build_sql(fields=inner_fields)
+                outer = expr if column is None else f"{func}(_agg_value)"
+                sql = f"SELECT {outer} FROM ({inner})"
+            else:
+                sql, params = self._build_sql(fields=[expr], order=False)
+            return self._run(sql, params)[1][0][0]
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to execute {expr} on '{self.table_name}': {e}")
+            return None
+
+    # Internal method counting the rows the query returns
+    def _count_rows(self) -> int:
+        sql, params = self._build_sql()
+        return self._run(f"SELECT COUNT(*) FROM ({sql});", params)[1][0][0]
+
+    # Internal method attaching included relations to a result (one IN query per relation and chunk)
+    def _load_related(self, result: EasyLiteResult, chunk_size: int = 500) -> EasyLiteResult:
+        if not self._includes:
+            return result
+        cols, rows = result.columns(), result.rows()
+        for table, name in self._includes:
+            try:
+                rel = self._relation(table)
+                if not rel:
+                    print(f"[ERROR] No foreign key links '{self.table_name}' and '{table}'.")
+                    continue
+                local_col, remote_col, many = rel
+                if local_col not in cols:
+                    print(f"[ERROR] Column '{local_col}' must be selected to include '{table}'.")
+                    continue
+                idx = cols.index(local_col)
+                keys = list({r[idx] for r in rows if r[idx] is not None})
+                grouped = {}
+                for start in range(0, len(keys), chunk_size):
+                    for item in self._related_rows(table, remote_col, keys[start:start + chunk_size]).toDict():
+                        grouped.setdefault(item[remote_col], []).append(item)
+                if many:
+                    result._related[name] = [grouped.get(r[idx], []) for r in rows]
+                else:
+                    result._related[name] = [grouped.get(r[idx], [None])[0] for r in rows]
+                print(f"[SUCCESS] Included '{table}' as '{name}' ({len(keys)} keys, {-(-len(keys) // chunk_size)} queries).")
+            except sqlite3.Error as e:
+                print(f"[ERROR] Failed to include '{table}' in '{self.table_name}': {e}")
+        return result
+
+    # Internal method fetching the rows of a related table whose column matches one of the keys
+    def _related_rows(self, table: str, column: str, keys: list) -> EasyLiteResult:
+        placeholders = ", ".join("?" for _ in keys)
+        cols, rows = self._run(f"SELECT * FROM {table} WHERE {column} IN ({placeholders});", keys)
+        return EasyLiteResult(rows, cols, EasyLiteQuery(self.connection, table)._decoders(cols))
+
+    # Internal method finding (local column, remote column, one-to-many?) between this table and another
+    def _relation(self, table: str):
+        c = self.connection.cursor()
+        c.execute(f"PRAGMA foreign_key_list({self.table_name});")
+        for fk in c.fetchall():
+            if fk[2] == table:
+                return fk[3], fk[4] or self._primary_key(table), False
+        c.execute(f"PRAGMA foreign_key_list({table});")
+        for fk in c.fetchall():
+            if fk[2] == self.table_name:
+                return fk[4] or self._primary_key(self.table_name), fk[3], True
+        return None
+
+    # Internal method returning the primary-key column of a table
+    def _primary_key(self, table: str) -> str:
+        c = self.connection.cursor()
+        c.execute(f"PRAGMA table_info({table});")
+        return next((col[1] for col in c.fetchall() if col[5]), "rowid")
+
+    # Internal method collecting the declared column types of the queried tables
+    def _declared_types(self) -> dict:
+        declared = {}
+        c = self.connection.cursor()
+        for tbl in [self.table_name] + [j[0] for j in self._joins]:
+            c.execute(f"PRAGMA table_info({tbl});")
+            for col in c.fetchall():
+                declared.setdefault(col[1], col[2])
+                declared.setdefault(f"{tbl}.{col[1]}", col[2])
+        # Aliased plain columns ("doc AS body") keep the declared type, and thus the codec, of the column
+        for f in self._fields:
+            m = re.fullmatch(r"\s*([\w.]+)\s+AS\s+(\w+)\s*", f, re.IGNORECASE)
+            if m and m.group(1) in declared:
+                declared[m.group(2)] = declared[m.group(1)]
+            elif not m and f != "*" and f not in declared:
+                used = [n for n, t in declared.items() if "." not in n and parseCodecType(t) and re.search(rf"\b{re.escape(n)}\b", f)]
+                if used:
+                    print(f"[WARNING] '{f}' uses compressed column(s) {', '.join(used)} inside an expression, the values are not decoded.")
+        return declared
+
+    # Internal method returning column names and a row iterator for exports
+    def _open_stream(self):
+        merged = self._run_partitions() if self._parallel else None
+        if merged:
+            cols, rows = merged
+        else:
+            sql, params = self._build_sql()
+            cols, chunks = self._run_chunks(sql, params)
+            rows = (row for chunk in chunks for row in chunk)
+        dec = self._decoders(cols)
+        if dec:
+            rows = (tuple(dec[i](v) if i in dec else v for i, v in enumerate(row)) for row in rows)
+        return cols, rows
+
+    # Internal method returning column names and an iterator of decoded row chunks for fetchArrays()
+    def _array_chunks(self, chunk_size: int):
+        sql, params = self._build_sql()
+        cols, chunks = self._run_chunks(sql, params, chunk_size)
+        decoders = self._decoders(cols)
+        if decoders:
+            chunks = (EasyLiteResult(chunk, cols, decoders).rows() for chunk in chunks)
+        return cols, chunks
+
+    # Internal method running one statement under the query's time/step budget, returning (columns, rows)
+    def _run(self, sql: str, params):
+        c = self.connection.cursor()
+        with self._guard.budget(self.connection, *self._budget):
+            c.execute(sql, params)
+            rows = c.fetchall()
+        return ([d[0] for d in c.description] if c.description else []), rows
+
+    # Internal method executing a statement and returning (columns, chunk iterator); every chunk is read
+    # under the same budget, which is not held while the caller processes rows
+    def _run_chunks(self, sql: str, params, chunk_size: int = 1000):
+        state = {}
+        c = self.connection.cursor()
+        with self._guard.budget(self.connection, *self._budget, state=state):
+            c.execute(sql, params)
+        cols = [d[0] for d in c.description] if c.description else []
+
+        def chunks():
+            while True:
+                with self._guard.budget(self.connection, *self._budget, state=state):
+                    chunk = c.fetchmany(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        return cols, chunks()
+
+    # Internal method mapping result column positions to codec decoders
+    def _decoders(self, cols: List[str]) -> dict:
+        try:
+            declared = self._declared_types()
+        except sqlite3.Error:
+            return {}
+        decoders = {}
+        for i, col in enumerate(cols):
+            parsed = parseCodecType(declared.get(col, ""))
+            if parsed:
+                decoders[i] = decoder(*parsed)
+        return decoders
+
+    # Internal method to split the table into rowid ranges (None means run serially)
+    def _partition_plan(self):
+        if self._group_by_columns:
+            print("[WARNING] Parallel scan does not support groupBy, running serially.")
+            return None
+        sort = self._sort_expr()
+        if sort and sort[2] not in _COLLATIONS:
+            print(f"[WARNING] Collation '{sort[2]}' cannot be merged across partitions, running serially.")
+            return None
+        try:
+            c = self.connection.cursor()
+            c.execute("PRAGMA database_list;")
+            db_path = next((row[2] for row in c.fetchall() if row[1] == "main"), "")
+            if not db_path:
+                print("[WARNING] Parallel scan needs a file database, running serially.")
+                return None
+            c.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {self.table_name};")
+            lo, hi = c.fetchone()
+        except sqlite3.Error as e:
+            print(f"[WARNING] Parallel scan unavailable for '{self.table_name}' ({e}), running serially.")
+            return None
+        if lo is None:
+            return None
+        workers, parts = self._parallel
+        step = max(1, -(-(hi - lo + 1) // parts))
+        ranges = [(start, min(start + step - 1, hi)) for start in range(lo, hi + 1, step)]
+        return db_path, ranges
+
+    # Internal method to scan every partition in worker processes and merge the rows as they arrive
+    # (None means run serially); only a few chunks per worker are in memory at any time
+    def _run_partitions(self):
+        plan = self._partition_plan()
+        if not plan:
+            return None
+        db_path, ranges = plan
+        workers, _ = self._parallel
+        jobs = [self._build_sql(rowid_range=r, sort_key=True) for r in ranges]
+        # Worker processes enforce the time/step budget with their own progress handler
+        timeout = self._guard.timeout if self._budget[0] is None else self._budget[0]
+        max_steps = self._guard.max_steps if self._budget[1] is None else self._budget[1]
+        ctx = multiprocessing.get_context()
+        ordered = self._sort_expr() is not None
+        if ordered:
+            # Every range streams its own sorted run, the runs are merged lazily
+            groups = [[job] for job in jobs]
+            queues = [ctx.Queue(PARTITION_QUEUE) for _ in groups]
+        else:
+            # Unordered: up to `workers` processes share the ranges and one queue, chunks are yielded as they come
+            n = min(workers, len(jobs))
+            groups = [jobs[i::n] for i in range(n)]
+            queues = [ctx.Queue(PARTITION_QUEUE * n)] * n
+        procs = [ctx.Process(target=_scanPartitions, args=(db_path, g, timeout, max_steps, q, i), daemon=True)
+                 for i, (g, q) in enumerate(zip(groups, queues))]
+        for p in procs:
+            p.start()
+
+        def stop():
+            for p in procs:
+                if p.is_alive():
+                    p.terminate()
+                p.join()
+
+        try:
+            # The first message on a queue is always column names (or the error that prevented them)
+            _, kind, cols = _nextMessage(queues[0], procs[:1] if ordered else procs)
+            if kind == "error":
+                raise cols
+            if ordered:
+                parts = [_drainPartitions(q, [p]) for q, p in zip(queues, procs)]
+            else:
+                parts = [_drainPartitions(queues[0], procs)]
+            cols, merged = self._merge_parts([(cols, part) for part in parts])
+        except BaseException:
+            stop()
+            raise
+
+        def rows():
+            try:
+                yield from merged
+            finally:
+                stop()
+        return cols, rows()
+
+    # Internal method merging (cols, rows) parts built with sort_key=True, honouring sortBy/limit
+    def _merge_parts(self, results):
+        cols = results[0][0] if results else []
+        parts = [rows for _, rows in results]
+        sort = self._sort_expr()
+        if sort:
+            _, direct, collation = sort
+            key = _sqliteSortKey(collation if collation in _COLLATIONS else "BINARY")
+            merged = heapq.merge(*parts, key=lambda r: key(r[-1]), reverse=(direct == "DESC"))
+            # Drop the hidden sort-key column
+            cols = cols[:-1]
+            merged = (r[:-1] for r in merged)
+        else:
+            merged = (r for p in parts for r in p)
+        if self._limit_count is not None:
+            merged = (r for i, r in zip(range(self._limit_count), merged))
+        return cols, merged
+
+    # Internal method returning (expression, direction, collation) of the effective ORDER BY, or None
+    def _sort_expr(self):
+        if self._order_clause:
+            expr, direct = self._order_clause
+        elif self._search_fields:
+            expr, direct = self._search_fields[0].split(" AS ")[0], "ASC"
+        else:
+            return None
+        m = re.search(r"\s+COLLATE\s+(\w+)\s*$", expr, re.IGNORECASE)
+        if m:
+            return expr, direct, m.group(1).upper()
+        return expr, direct, self._column_collation(expr.split(".")[-1])
+
+    # Internal method reading the declared collation of a column from its CREATE TABLE statement
+    def _column_collation(self, column: str) -> str:
+        try:
+            c = self.connection.cursor()
+            c.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?;", (self.table_name,))
+            row = c.fetchone()
+        except sqlite3.Error:
+            return "BINARY"
+        if row and row[0]:
+            m = re.search(rf"[(,]\s*[\"`\[]?{re.escape(column)}[\"`\]]?\s[^,]*?\bCOLLATE\s+(\w+)", row[0], re.IGNORECASE)
+            if m:
+                return m.group(1).upper()
+        return "BINARY"
+
     # Build the final SQL query
-    def _build_sql(self) -> Tuple[str, list]:
-        fstr = ", ".join(self._fields)
+    def _build_sql(self, rowid_range: Tuple[int, int] = None, fields: List[str] = None, order: bool = True,
+                   sort_key: bool = False) -> Tuple[str, list]:
+        if fields:
+            fstr = ", ".join(fields)
+        else:
+            base = [f"{self.table_name}.*" if f == "*" and self._search_fields else f for f in self._fields]
+            fstr = ", ".join(base + self._search_fields)
+        # Partial results carry the sort key as a last, hidden column so they can be merged in order
+        sort = self._sort_expr() if sort_key else None
+        if sort:
+            fstr += f", {sort[0]} AS easylite_sort"
+        params = list(self._params)
         sql = f"SELECT {fstr} FROM {self.table_name}"
 
         # Build joins
@@ -81,8 +636,12 @@ class EasyLiteQuery:
             sql += f" {jtype} JOIN {tbl} ON {cond}"
 
         # WHERE
-        if self._where_clauses:
-            w = " AND ".join(self._where_clauses)
+        where_clauses = list(self._where_clauses)
+        if rowid_range:
+            where_clauses.append(f"{self.table_name}.rowid BETWEEN ? AND ?")
+            params.extend(rowid_range)
+        if where_clauses:
+            w = " AND ".join(f"({x})" if rowid_range else x for x in where_clauses)
             sql += f" WHERE {w}"
 
         # GROUP BY
@@ -91,12 +650,14 @@ class EasyLiteQuery:
             sql += f" GROUP BY {g}"
 
         # ORDER BY
-        if self._order_clause:
+        if self._order_clause and order:
             col, direct = self._order_clause
             sql += f" ORDER BY {col} {direct}"
+        elif self._search_fields and order and not fields:
+            sql += " ORDER BY rank ASC"
 
         # LIMIT
-        if self._limit_count is not None:
+        if self._limit_count is not None and order:
             sql += f" LIMIT {self._limit_count}"
 
-        return sql, self._params
+        return sql, params
@@ -1,6 +1,7 @@
 # EasyLiteRecord.py
 import sqlite3
 from typing import Any, List, Dict
+from .EasyLiteCodec import tableEncoders
 
 class EasyLiteRecord:
     def __init__(self, core, table_name: str, mode: str):
@@ -13,10 +14,16 @@ class EasyLiteRecord:
         self._where_params: List[Any] = []
         self._table_info: List[Any] = []
         self._multi_rows: List[List[Any]] = []
+        self.future = None
+        self.lastrowid = None
         self._load_table_info()
+        self._encoders = tableEncoders(self._table_info)
 
     def _load_table_info(self):
         try:
+            if self.core.writer:
+                self._table_info = self.core.writer.tableInfo(self.table_name)
+                return
             c = self.connection.cursor()
             c.execute(f"PRAGMA table_info({self.table_name});")
             self._table_info = c.fetchall()
@@ -99,12 +106,14 @@ class EasyLiteRecord:
             sql = f"DELETE FROM {self.table_name}"
             if self._where_clause:
                 sql += f" WHERE {self._where_clause}"
+            if self.core.writer:
+                return self._enqueue(sql, [self._where_params])
             c = self.connection.cursor()
             c.execute(sql, self._where_params)
-            self.connection.commit()
+            self.core._commit()
             print(f"[SUCCESS] Records deleted from '{self.table_name}'.")
         except sqlite3.Error as e:
-            print(f"[ERROR] {e}")
+            self._reportError(e)
         return self
 
     def _insert_single(self):
@@ -114,16 +123,19 @@ class EasyLiteRecord:
 
         cols = list(self._values_dict.keys())
         placeholders = ", ".join("?" for _ in cols)
-        vals = [self._values_dict[c] for c in cols]
+        vals = [self._encode(c, self._values_dict[c]) for c in cols]
 
         sql = f"INSERT INTO {self.table_name} ({', '.join(cols)}) VALUES ({placeholders})"
+        if self.core.writer:
+            return self._enqueue(sql, [vals])
         try:
             c = self.connection.cursor()
             c.execute(sql, vals)
-            self.connection.commit()
+            self.core._commit()
+            self.lastrowid = c.lastrowid
             print(f"[SUCCESS] Inserted a new record into '{self.table_name}'.")
         except sqlite3.Error as e:
-            print(f"[ERROR] {e}")
+            self._reportError(e)
         return self
 
     def _insert_multi(self):
@@ -136,29 +148,36 @@ class EasyLiteRecord:
         placeholders = ", ".join("?" for _ in col_names)
         sql = f"INSERT INTO {self.table_name} ({', '.join(col_names)}) VALUES ({placeholders})"
 
+        all_vals = []
+        for row_vals in self._multi_rows:
+            final_vals = []
+            for i in range(len(col_names)):
+                if i < len(row_vals):
+                    v = row_vals[i]
+                    if v is self.core.skip:
+                        final_vals.append(None)
+                    elif v is self.core.null:
+                        final_vals.append(None)
+                    else:
+                        final_vals.append(self._encode(col_names[i], v))
+                else:
+                    final_vals.append(None)
+            all_vals.append(final_vals)
+        if self.core.writer:
+            return self._enqueue(sql, all_vals)
+
         c = self.connection.cursor()
         inserted_count = 0
 
         try:
-            for row_vals in self._multi_rows:
-                final_vals = []
-                for i in range(len(col_names)):
-                    if i < len(row_vals):
-                        v = row_vals[i]
-                        if v is self.core.skip:
-                            final_vals.append(None)
-                        elif v is self.core.null:
-                            final_vals.append(None)
-                        else:
-                            final_vals.append(v)
-                    else:
-                        final_vals.append(None)
+            for final_vals in all_vals:
                 c.execute(sql, final_vals)
                 inserted_count += 1
-            self.connection.commit()
+            self.core._commit()
+            self.lastrowid = c.lastrowid
             print(f"[SUCCESS] Inserted {inserted_count} records into '{self.table_name}'.")
         except sqlite3.Error as e:
-            print(f"[ERROR] {e}")
+            self._reportError(e)
         return self
 
     def _update_record(self):
@@ -167,7 +186,7 @@ class EasyLiteRecord:
             return self
 
         set_clause = ", ".join(f"{col} = ?" for col in self._values_dict.keys())
-        vals = list(self._values_dict.values())
+        vals = [self._encode(c, v) for c, v in self._values_dict.items()]
 
         sql = f"UPDATE {self.table_name} SET {set_clause}"
 
@@ -177,12 +196,33 @@ class EasyLiteRecord:
         else:
             print("[WARNING] No WHERE clause specified. Updating ALL rows.")
 
+        if self.core.writer:
+            return self._enqueue(sql, [vals])
         try:
             c = self.connection.cursor()
             c.execute(sql, vals)
-            self.connection.commit()
+            self.core._commit()
             print(f"[SUCCESS] Updated records in '{self.table_name}'.")
         except sqlite3.Error as e:
-            print(f"[ERROR] {e}")
+            self._reportError(e)
+
+        return self
 
+    # Print a write error and let an active bulk-load session know about it
+    def _reportError(self, e: Exception):
+        print(f"[ERROR] {e}")
+        if self.core._bulk:
+            self.core._bulk.errors.append(e)
+
+    # Compress a value when its column has a codec
+    def _encode(self, column_name: str, value: Any) -> Any:
+        enc = self._encoders.get(column_name)
+        return enc(value) if enc else value
+
+    # Hand the statement to the write-behind queue; completion is reported through self.future
+    def _enqueue(self, sql: str, params_list: List[Any]):
+        try:
+            self.future = self.core.writer.submit(sql, params_list)
+        except RuntimeError as e:
+            self._reportError(e)
         return self
@@ -1,17 +1,24 @@
 # EasyLiteResult.py
 import csv
 import json
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Dict, Callable
+from .EasyLiteArrays import _guessDtype, _fillArrays
 
 # Class to handle query results
 class EasyLiteResult:
     # Constructor
-    def __init__(self, rows: List[Tuple[Any]], columns: List[str]):
+    def __init__(self, rows: List[Tuple[Any]], columns: List[str], decoders: Dict[int, Callable[[Any], Any]] = None):
         self._rows = rows
         self._columns = columns
+        self._decoders = decoders or {}
+        self._related = {}
 
-    # Returns all rows
+    # Returns all rows (compressed columns are decoded on first access)
     def rows(self) -> List[Tuple[Any]]:
+        if self._decoders:
+            dec = self._decoders
+            self._rows = [tuple(dec[i](v) if i in dec else v for i, v in enumerate(row)) for row in self._rows]
+            self._decoders = {}
         return self._rows
 
     # Returns column names
@@ -22,13 +29,34 @@ class EasyLiteResult:
     def count(self) -> int:
         return len(self._rows)
 
-    # Returns a list of dicts, each dict representing a row
+    # Returns a dict of NumPy masked arrays, one per column (dtypes guessed from values unless given)
+    def toArrays(self, dtypes: dict = None) -> dict:
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            print("[ERROR] toArrays() requires NumPy. Install it with 'pip install numpy'.")
+            return {}
+        try:
+            overrides = dtypes or {}
+            col_dtypes = [overrides.get(col, _guessDtype(row[i] for row in self.rows())) for i, col in enumerate(self._columns)]
+            return _fillArrays([self.rows()], len(self._rows), self._columns, col_dtypes)
+        except (ValueError, TypeError) as e:
+            print(f"[ERROR] Failed to convert result to arrays: {e}")
+            return {}
+
+    # Returns the eagerly loaded relation values, one per row (list for one-to-many, dict or None for many-to-one)
+    def related(self, name: str) -> list:
+        return self._related.get(name, [])
+
+    # Returns a list of dicts, each dict representing a row (included relations are nested)
     def toDict(self) -> List[dict]:
         data = []
-        for row in self._rows:
+        for i, row in enumerate(self.rows()):
             item = {}
             for col, val in zip(self._columns, row):
                 item[col] = val
+            for name, values in self._related.items():
+                item[name] = values[i]
             data.append(item)
         return data
 
@@ -39,7 +67,7 @@ class EasyLiteResult:
             buffer = io.StringIO()
             writer = csv.writer(buffer)
             writer.writerow(self._columns)
-            writer.writerows(self._rows)
+            writer.writerows(self.rows())
             return buffer.getvalue()
         except Exception as e:
             print(f"[ERROR] Failed to generate CSV string: {e}")
@@ -51,7 +79,7 @@ class EasyLiteResult:
             with open(csv_filename, "w", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
                 writer.writerow(self._columns)
-                writer.writerows(self._rows)
+                writer.writerows(self.rows())
             print(f"[SUCCESS] CSV file has been successfully exported to '{csv_filename}'.")
         except Exception as e:
             print(f"[ERROR] Failed to export CSV file '{csv_filename}': {e}")
@@ -64,14 +92,14 @@ class EasyLiteResult:
         col_widths = []
         for i, col_name in enumerate(self._columns):
             try:
-                max_len_in_col = max((len(str(row[i])) for row in self._rows), default=0)
+                max_len_in_col = max((len(str(row[i])) for row in self.rows()), default=0)
             except Exception:
                 max_len_in_col = 0
             col_widths.append(max(len(col_name), max_len_in_col))
         header_line = " | ".join(col_name.ljust(col_widths[i]) for i, col_name in enumerate(self._columns))
         print(header_line)
         print("-" * len(header_line))
-        for row in self._rows:
+        for row in self.rows():
             row_line = " | ".join(str(row[i]).ljust(col_widths[i]) for i in range(len(self._columns)))
             print(row_line)
 
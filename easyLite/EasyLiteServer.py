@@ -0,0 +1,295 @@
+# EasyLiteServer.py
+import json
+import queue
+import base64
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+from .EasyLiteQuery import EasyLiteQuery
+
+# Query-string keys with a special meaning (every other key is an equality filter on a column)
+RESERVED_PARAMS = {"fields", "sort", "desc", "limit", "after"}
+
+# Prefixes of SQLite and easyLite internal tables, only served when listed in `tables`
+INTERNAL_PREFIXES = ("sqlite_", "easylite_")
+
+
+# Pool of read-only connections shared by the request threads
+class EasyLiteReadPool:
+    # Constructor
+    def __init__(self, uri: str, size: int = 4):
+        self._uri = uri
+        self._idle = queue.Queue()
+        self._all = []
+        for _ in range(size):
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON;")
+            self._all.append(conn)
+            self._idle.put(conn)
+
+    # Borrow a connection for the duration of a block
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        for conn in self._all:
+            conn.close()
+        self._all = []
+
+
+# Serves parameterized SELECTs over HTTP as the toApiJSON() envelope, with ETag caching
+class EasyLiteServer:
+    # Constructor
+    def __init__(self, uri: str, host: str = "127.0.0.1", port: int = 8080, pool_size: int = 4,
+                 tables: list = None, max_limit: int = 1000, cache_size: int = 256, cache_max_bytes: int = 1 << 20):
+        self.pool = EasyLiteReadPool(uri, pool_size)
+        self.tables = set(tables) if tables else None
+        self.max_limit = max_limit
+        self.cache_size = cache_size
+        self.cache_max_bytes = cache_max_bytes
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Dedicated connection for PRAGMA data_version: it never writes, so every commit made
+        # elsewhere bumps its value
+        self._watch = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._watch_lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handlerClass())
+        self.httpd.daemon_threads = True
+        self.address = self.httpd.server_address
+
+    # Serve in a background thread
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.httpd.serve_forever, name="easyLite-server", daemon=True)
+            self._thread.start()
+            print(f"[SUCCESS] Serving on http://{self.address[0]}:{self.address[1]}/<table>.")
+        return self
+
+    # Serve in the calling thread until interrupted
+    def serveForever(self):
+        print(f"[SUCCESS] Serving on http://{self.address[0]}:{self.address[1]}/<table>.")
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    # Stop serving and close every connection
+    def stop(self):
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+        self.pool.close()
+        self._watch.close()
+        print("[SUCCESS] HTTP service stopped.")
+
+    # Current data version (changes whenever another connection commits)
+    def dataVersion(self) -> int:
+        with self._watch_lock:
+            return self._watch.execute("PRAGMA data_version;").fetchone()[0]
+
+    # Internal method turning a request into a query (names are checked against the schema, values are bound)
+    def _buildQuery(self, conn, table: str, args: list):
+        if self.tables is not None and table not in self.tables:
+            raise ValueError(f"Unknown table '{table}'.")
+        if self.tables is None and table.lower().startswith(INTERNAL_PREFIXES):
+            raise ValueError(f"Unknown table '{table}'.")
+        columns = self._tableColumns(conn, table)
+        if not columns:
+            raise ValueError(f"Unknown table '{table}'.")
+        opts = {k: v for k, v in args if k in RESERVED_PARAMS}
+        fields = [f for f in opts.get("fields", "").split(",") if f] or list(columns)
+        sort = opts.get("sort", "rowid")
+        for name in fields + [sort] + [k for k, _ in args if k not in RESERVED_PARAMS]:
+            if name not in columns and name != "rowid":
+                raise ValueError(f"Unknown column '{name}'.")
+        try:
+            limit = int(opts.get("limit", self.max_limit))
+        except ValueError:
+            raise ValueError("limit must be an integer.")
+        # A negative LIMIT means "no limit" to SQLite
+        if limit < 0:
+            raise ValueError(f"limit must be between 0 and {self.max_limit}.")
+        limit = min(limit, self.max_limit)
+        descending = opts.get("desc", "0").lower() in ("1", "true", "yes")
+
+        # The sort key and the rowid are selected last so the next keyset page can be reported;
+        # ordering by (sort, rowid) makes the key unique even when the sort column has ties
+        direction = "DESC" if descending else "ASC"
+        if sort == "rowid":
+            q = EasyLiteQuery(conn, table).fields(*fields, "rowid AS easylite_rowid").sortBy("rowid", not descending)
+        else:
+            q = EasyLiteQuery(conn, table).fields(*fields, f"{sort} AS easylite_key", "rowid AS easylite_rowid")
+            q.sortBy(f"{sort} {direction}, rowid", not descending)
+        for k, v in args:
+            if k not in RESERVED_PARAMS:
+                q.where(f"{k} = ?", v)
+        if "after" in opts:
+            self._afterClause(q, sort, descending, opts["after"])
+        return q.limit(limit), limit
+
+    # Internal method adding the keyset condition for the page after `after` ("next" of the previous page)
+    def _afterClause(self, q, sort: str, descending: bool, after: str):
+        try:
+            key = json.loads(after)
+        except ValueError:
+            raise ValueError("after must be the 'next' value of the previous page.")
+        op = "<" if descending else ">"
+        if sort == "rowid":
+            if not isinstance(key, int):
+                raise ValueError("after must be the 'next' value of the previous page.")
+            q.where(f"rowid {op} ?", key)
+            return
+        if not (isinstance(key, list) and len(key) == 2 and isinstance(key[1], int)):
+            raise ValueError("after must be the 'next' value of the previous page.")
+        value, rowid = key
+        # NULLs sort first: ascending pages move from NULLs to values, descending pages end with NULLs
+        if value is None:
+            if descending:
+                q.where(f"({sort} IS NULL AND rowid < ?)", rowid)
+            else:
+                q.where(f"(({sort} IS NULL AND rowid > ?) OR {sort} IS NOT NULL)", rowid)
+        elif descending:
+            q.where(f"(({sort}, rowid) < (?, ?) OR {sort} IS NULL)", value, rowid)
+        else:
+            q.where(f"({sort}, rowid) > (?, ?)", value, rowid)
+
+    # Internal method listing the column names of a table
+    def _tableColumns(self, conn, table: str) -> list:
+        return [col[1] for col in conn.execute(f"PRAGMA table_info({_quote(table)});").fetchall()]
+
+    # Internal method yielding the JSON envelope in pieces
+    def _envelope(self, cols, rows, limit: int):
+        hidden = 2 if "easylite_key" in cols else 1
+        names = [json.dumps(c) for c in cols[:-hidden]]
+        count, last = 0, None
+        yield '{"status": "success", "data": ['
+        for row in rows:
+            item = ", ".join(f"{n}: {json.dumps(v, default=_jsonDefault)}" for n, v in zip(names, row))
+            yield ("{" if not count else ", {") + item + "}"
+            count += 1
+            last = row[-1] if hidden == 1 else list(row[-2:])
+        following = json.dumps(last, default=_jsonDefault) if count == limit else "null"
+        yield f'], "count": {count}, "next": {following}}}'
+
+    # Internal method building the request handler class bound to this server
+    def _handlerClass(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Buffer headers and body into few writes and send them without Nagle delays
+            wbufsize = 1 << 16
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                table = parts.path.strip("/")
+                args = parse_qsl(parts.query, keep_blank_values=True)
+                key = (table, tuple(sorted(args)))
+                version = service.dataVersion()
+                etag = f'"{version}-{abs(hash(key)):x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                with service._cache_lock:
+                    cached = service._cache.get(key)
+                    if cached and cached[0] == version:
+                        service._cache.move_to_end(key)
+                if cached and cached[0] == version:
+                    self._send(200, cached[1], etag)
+                    return
+                try:
+                    with service.pool.connection() as conn:
+                        q, limit = service._buildQuery(conn, table, args)
+                        cols, rows = q._open_stream()
+                        self._stream(key, version, etag, service._envelope(cols, rows, limit))
+                except ValueError as e:
+                    self._error(400, str(e))
+                except sqlite3.Error as e:
+                    self._error(500, str(e))
+
+            # Send the envelope with chunked encoding, keeping a copy for the cache while it is small
+            def _stream(self, key, version, etag, pieces):
+                buffer = [next(pieces)]
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                self._kept, self._kept_size = [], 0
+                try:
+                    for piece in pieces:
+                        buffer.append(piece)
+                        if len(buffer) >= 256:
+                            self._flush(buffer)
+                    self._flush(buffer)
+                except sqlite3.Error:
+                    # Headers are already sent: drop the connection so the client sees a truncated body
+                    self.close_connection = True
+                    return
+                self.wfile.write(b"0\r\n\r\n")
+                if self._kept is not None and service.cache_size:
+                    with service._cache_lock:
+                        service._cache[key] = (version, b"".join(self._kept))
+                        service._cache.move_to_end(key)
+                        while len(service._cache) > service.cache_size:
+                            service._cache.popitem(last=False)
+
+            # Write the buffered pieces as one chunk
+            def _flush(self, buffer):
+                data = "".join(buffer).encode("utf-8")
+                buffer.clear()
+                if data:
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                if self._kept is not None:
+                    self._kept_size += len(data)
+                    if self._kept_size > service.cache_max_bytes:
+                        self._kept = None
+                    else:
+                        self._kept.append(data)
+
+            def _send(self, status: int, body: bytes, etag: str = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _error(self, status: int, message: str):
+                body = json.dumps({"status": "error", "count": 0, "data": [], "message": message}).encode("utf-8")
+                self._send(status, body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+# Internal helper quoting an identifier for PRAGMA statements
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+# Internal helper serializing values json cannot handle (BLOBs become base64 strings)
+def _jsonDefault(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(value)).decode("ascii")
+    return str(value)
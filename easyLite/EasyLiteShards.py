@@ -0,0 +1,423 @@
+# EasyLiteShards.py
+import re
+import math
+import zlib
+import bisect
+import sqlite3
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Union
+from .EasyLiteQuery import EasyLiteQuery, _sqliteSortKey
+from .EasyLiteRecord import EasyLiteRecord
+from .EasyLiteResult import EasyLiteResult
+from .EasyLiteGuard import EasyLiteGuard
+
+# Size of the AUTOINCREMENT id range reserved for each shard (shard i hands out ids after i * SHARD_ID_SPAN)
+SHARD_ID_SPAN = 1 << 40
+
+# Text that SQLite's numeric affinity turns into a number ('5', ' 5 ', '5.0', '1e3')
+_NUMERIC = re.compile(r"\s*[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?\s*")
+
+# Aggregates that can be computed per shard and combined (AVG is rebuilt from SUM and COUNT)
+_COMBINABLE = re.compile(r"\s*(COUNT|SUM|MIN|MAX|AVG)\s*\((.*)\)\s*(?:AS\s+(\w+))?\s*", re.IGNORECASE)
+
+
+# Maps shard-key values to shard databases
+class EasyLiteShardRouter:
+    # Constructor (ranges are sorted upper bounds: value < ranges[i] goes to shard i)
+    def __init__(self, shards: list, shard_key: Union[str, dict], ranges: list = None):
+        self.shards = shards
+        self.shard_key = shard_key
+        self.ranges = ranges
+        if ranges is not None and len(ranges) != len(shards) - 1:
+            raise ValueError("ranges must contain exactly one upper bound less than the number of shards.")
+        # Bounds compared in SQLite order (NULL < numbers < text < BLOB), so any key type can be placed
+        self._bounds = [_sqliteSortKey()(self._normalize(r)) for r in ranges] if ranges is not None else None
+        self._keys = {}
+
+    # Shard-key column of a table, or None when the table is replicated on every shard
+    def keyFor(self, table_name: str):
+        if isinstance(self.shard_key, dict):
+            return self.shard_key.get(table_name)
+        if table_name not in self._keys:
+            c = self.shards[0].connection.cursor()
+            c.execute(f"PRAGMA table_info({table_name});")
+            cols = [col[1] for col in c.fetchall()]
+            if not cols:
+                return self.shard_key
+            self._keys[table_name] = self.shard_key if self.shard_key in cols else None
+        return self._keys[table_name]
+
+    # Index of the shard owning a key value (values SQLite compares as equal, e.g. 5, 5.0 and '5', share a shard)
+    def shardFor(self, value: Any) -> int:
+        value = self._normalize(value)
+        if self.ranges is not None:
+            return bisect.bisect_right(self._bounds, _sqliteSortKey()(value))
+        if value is None:
+            return 0
+        if isinstance(value, int):
+            return value % len(self.shards)
+        return zlib.crc32(repr(value).encode("utf-8")) % len(self.shards)
+
+    # Internal method reducing a key to one canonical value: numeric text becomes a number, integral floats ints
+    @staticmethod
+    def _normalize(value: Any) -> Any:
+        if isinstance(value, str) and _NUMERIC.fullmatch(value):
+            number = float(value)
+            value = int(value) if re.fullmatch(r"\s*[+-]?\d+\s*", value) else number
+        if isinstance(value, float) and math.isfinite(value) and value.is_integer():
+            return int(value)
+        return value
+
+    # Forget cached shard keys (after schema changes)
+    def reset(self):
+        self._keys = {}
+
+
+# Applies every builder call to all shards
+class EasyLiteShardBuild:
+    # Constructor
+    def __init__(self, router: EasyLiteShardRouter, builders: list):
+        self.router = router
+        self._builders = builders
+
+    def __getattr__(self, name: str):
+        def call(*args, **kwargs):
+            for b in self._builders:
+                getattr(b, name)(*args, **kwargs)
+            self.router.reset()
+            if name == "create":
+                self._seedSequences()
+            return self
+        return call
+
+    # Internal method giving every shard its own AUTOINCREMENT range so ids stay unique across shards
+    def _seedSequences(self):
+        table_name = self._builders[0].table_name
+        if self.router.keyFor(table_name) is None:
+            return
+        for idx, b in enumerate(self._builders):
+            c = b.connection.cursor()
+            try:
+                c.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?;", (table_name,))
+                row = c.fetchone()
+                if not row or "AUTOINCREMENT" not in row[0].upper():
+                    print(f"[WARNING] '{table_name}' has no AUTOINCREMENT primary key, its ids are only unique per shard.")
+                    return
+                c.execute("INSERT INTO sqlite_sequence (name, seq) SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = ?);",
+                          (table_name, idx * SHARD_ID_SPAN, table_name))
+                b.connection.commit()
+            except sqlite3.Error as e:
+                print(f"[ERROR] Failed to reserve an id range for '{table_name}' on shard {idx}: {e}")
+
+
+# Records fluent write calls and replays them on the owning shard(s)
+class EasyLiteShardRecord:
+    # Constructor
+    def __init__(self, router: EasyLiteShardRouter, table_name: str, mode: str):
+        self.router = router
+        self.table_name = table_name
+        self.mode = mode
+        self._ops = []
+        self._rows = []
+        self._where = None
+        self.records: List[EasyLiteRecord] = []
+
+    def row(self, *values: Any):
+        if self.mode == "insert":
+            self._rows.append(values)
+        else:
+            self._ops.append(("row", values))
+        return self
+
+    def multiRows(self, rows: List[List[Any]]):
+        self._rows.extend(rows)
+        return self
+
+    def field(self, column_name: str, value: Any):
+        self._ops.append(("field", (column_name, value)))
+        return self
+
+    def where(self, clause: str, *params):
+        self._where = (clause, params)
+        return self
+
+    def record(self):
+        if self.mode == "insert":
+            return self._insert()
+        key = self.router.keyFor(self.table_name)
+        if key and any(op == "field" and args[0] == key for op, args in self._ops):
+            print(f"[ERROR] Changing the shard key '{key}' of '{self.table_name}' is not supported.")
+            return self
+        for idx in self._targets():
+            self._replay(idx, self._ops, "record")
+        return self
+
+    def execute(self):
+        for idx in self._targets():
+            self._replay(idx, [], "execute")
+        return self
+
+    # Internal method routing an insert by the shard-key value of each row
+    def _insert(self):
+        key = self.router.keyFor(self.table_name)
+        if key is None:
+            for idx in range(len(self.router.shards)):
+                self._replay(idx, self._ops, "record", self._rows)
+            return self
+        fields = {args[0]: args[1] for op, args in self._ops if op == "field"}
+        if not self._rows:
+            if key not in fields:
+                print(f"[ERROR] Sharded insert into '{self.table_name}' needs a value for shard key '{key}'.")
+                return self
+            self._replay(self.router.shardFor(fields[key]), self._ops, "record")
+            return self
+        c = self.router.shards[0].connection.cursor()
+        c.execute(f"PRAGMA table_info({self.table_name});")
+        non_pk = [col[1] for col in c.fetchall() if col[5] == 0]
+        if key not in non_pk:
+            print(f"[ERROR] Rows for '{self.table_name}' cannot carry the shard key '{key}' (it is the primary key), use field() instead.")
+            return self
+        pos = non_pk.index(key)
+        groups = {}
+        for r in self._rows:
+            groups.setdefault(self.router.shardFor(r[pos] if pos < len(r) else None), []).append(r)
+        for idx, rows in groups.items():
+            self._replay(idx, [], "record", rows)
+        return self
+
+    # Internal method choosing the shards touched by an update/delete
+    def _targets(self):
+        key = self.router.keyFor(self.table_name)
+        if key and self._where:
+            clause, params = self._where
+            if re.fullmatch(rf"\s*{re.escape(key)}\s*=\s*\?\s*", clause) and params:
+                return [self.router.shardFor(params[0])]
+        return range(len(self.router.shards))
+
+    # Internal method replaying the recorded calls on one shard
+    def _replay(self, idx: int, ops, terminal: str, rows=None):
+        rec = EasyLiteRecord(self.router.shards[idx], self.table_name, self.mode)
+        for op, args in ops:
+            getattr(rec, op)(*args)
+        if rows:
+            rec.multiRows(list(rows))
+        if self._where:
+            rec.where(self._where[0], *self._where[1])
+        getattr(rec, terminal)()
+        self.records.append(rec)
+
+
+# SELECT fanned out over every shard and merged
+class EasyLiteShardQuery(EasyLiteQuery):
+    # Constructor
+    def __init__(self, router: EasyLiteShardRouter, table_name: str, guard: EasyLiteGuard = None):
+        super().__init__(router.shards[0].connection, table_name, guard=guard)
+        self.router = router
+
+    # Execute on the relevant shards and return merged results
+    def fetch(self) -> EasyLiteResult:
+        try:
+            if self._splitGroups():
+                cols, rows = self._combineGroups(self._fields)
+            else:
+                cols, rows = self._open_stream()
+                rows = list(rows)
+            print('[SUCCESS] Sharded query executed, EasyLiteResult object returned.')
+            return self._load_related(EasyLiteResult(rows, cols))
+        except (sqlite3.Error, ValueError) as e:
+            print(f"[ERROR] Failed to execute sharded SELECT query on '{self.table_name}': {e}")
+            return EasyLiteResult([], [])
+
+    # Check whether at least one row matches on any shard
+    def exists(self) -> bool:
+        if self._limit_count == 0:
+            return False
+        sql, params = self._build_sql(fields=["1"], order=False)
+        try:
+            return any(r[0] for _, rows in self._run_shards(f"SELECT EXISTS({sql})", params) for r in rows)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to run EXISTS query on '{self.table_name}': {e}")
+            return False
+
+    # Run aggregate expressions on every shard and combine them per group
+    def aggregate(self, *expressions: str) -> EasyLiteResult:
+        try:
+            if self._splitGroups() or not self._group_by_columns and len(self._targets()) > 1:
+                cols, rows = self._combineGroups(self._group_by_columns + list(expressions))
+            else:
+                sql, params = self._build_sql(fields=self._group_by_columns + list(expressions))
+                results = self._run_shards(sql, params)
+                cols, rows = results[0][0], [r for _, part in results for r in part]
+            print('[SUCCESS] Aggregate query executed on every shard, EasyLiteResult object returned.')
+            return EasyLiteResult(rows, cols)
+        except (sqlite3.Error, ValueError) as e:
+            print(f"[ERROR] Failed to execute aggregate query on '{self.table_name}': {e}")
+            return EasyLiteResult([], [])
+
+    # Internal method telling whether groups may span several shards (not grouped by the shard key)
+    def _splitGroups(self) -> bool:
+        if not self._group_by_columns or len(self._targets()) == 1:
+            return False
+        key = self.router.keyFor(self.table_name)
+        return not any(g.split(".")[-1] == key for g in self._group_by_columns)
+
+    # Internal method computing group columns and combinable aggregates per shard and merging them per group
+    def _combineGroups(self, fields: list):
+        groups = self._group_by_columns
+        partial, plan, cols = [], [], []
+        for f in fields:
+            if f in groups:
+                plan.append(("GROUP", groups.index(f)))
+                cols.append(f.split(".")[-1])
+                continue
+            m = _COMBINABLE.fullmatch(f)
+            if not m:
+                raise ValueError(f"'{f}' cannot be combined across shards (use COUNT, SUM, MIN, MAX or AVG, or group by the shard key).")
+            func, arg = m.group(1).upper(), m.group(2)
+            plan.append((func, len(partial)))
+            partial += [f"SUM({arg})", f"COUNT({arg})"] if func == "AVG" else [f"{func}({arg})"]
+            cols.append(m.group(3) or f.strip())
+        sql, params = self._build_sql(fields=groups + partial, order=False)
+        n = len(groups)
+        merged = {}
+        for _, rows in self._run_shards(sql, params):
+            for r in rows:
+                merged.setdefault(tuple(r[:n]), []).append(r[n:])
+        out = []
+        for key, parts in merged.items():
+            row = []
+            for func, i in plan:
+                if func == "GROUP":
+                    row.append(key[i])
+                elif func == "AVG":
+                    count = sum(p[i + 1] for p in parts)
+                    row.append(self._combine("SUM", [p[i] for p in parts]) / count if count else None)
+                else:
+                    row.append(self._combine(func, [p[i] for p in parts]))
+            out.append(tuple(row))
+        if self._order_clause:
+            col, direct = self._order_clause
+            name = col.split(".")[-1]
+            if name not in cols:
+                raise ValueError(f"sort column '{col}' must be one of the selected group columns or aggregates.")
+            idx, key = cols.index(name), _sqliteSortKey()
+            out.sort(key=lambda r: key(r[idx]), reverse=(direct == "DESC"))
+        if self._limit_count is not None:
+            out = out[:self._limit_count]
+        return cols, out
+
+    # Summary tables are maintained by triggers on a single database and cannot cover several shards
+    def summaryTable(self, name: str, **aggregates: str):
+        print(f"[ERROR] summaryTable() is not available on sharded tables ('{self.table_name}'), use aggregate() instead.")
+        return None
+
+    # Parallel partitioned scans do not apply: shards are already queried in parallel
+    def parallel(self, workers: int = None, partitions: int = None):
+        return self
+
+    # Internal method running the query on every relevant shard and merging the parts
+    def _open_stream(self):
+        sql, params = self._build_sql(sort_key=True)
+        cols, rows = self._merge_parts(self._run_shards(sql, params))
+        dec = self._decoders(cols)
+        if dec:
+            rows = (tuple(dec[i](v) if i in dec else v for i, v in enumerate(row)) for row in rows)
+        return cols, rows
+
+    # Internal method cutting the merged, decoded stream into chunks for fetchArrays()
+    def _array_chunks(self, chunk_size: int):
+        cols, rows = self._open_stream()
+        return cols, iter(lambda: list(islice(rows, chunk_size)), [])
+
+    # Internal method fetching related rows through the router (the related table may be sharded too)
+    def _related_rows(self, table: str, column: str, keys: list) -> EasyLiteResult:
+        q = EasyLiteShardQuery(self.router, table, guard=self._guard)
+        q._budget = self._budget
+        cols, rows = q.where(f"{column} IN ({', '.join('?' for _ in keys)})", *keys)._open_stream()
+        return EasyLiteResult(list(rows), cols)
+
+    # Internal method counting the rows of the merged result
+    def _count_rows(self) -> int:
+        cols, rows = self._open_stream()
+        return sum(1 for _ in rows)
+
+    # Internal method combining a single aggregate computed on each shard
+    def _aggregate(self, func: str, column: str):
+        if func == "AVG":
+            total, count = self._aggregate("SUM", column), self._aggregate("COUNT", column)
+            if isinstance(total, dict):
+                return {k: (total[k] / count[k] if count.get(k) else None) for k in total}
+            return total / count if count else None
+        if self._limit_count is not None:
+            values = [r[0] for r in self._fieldValues(column or "1")]
+            return self._combine(func, values, per_row=True)
+        expr = func if column is None else f"{func}({column})"
+        try:
+            if self._group_by_columns:
+                sql, params = self._build_sql(fields=self._group_by_columns + [expr])
+                n = len(self._group_by_columns)
+                grouped = {}
+                for _, rows in self._run_shards(sql, params):
+                    for r in rows:
+                        grouped.setdefault(r[0] if n == 1 else tuple(r[:n]), []).append(r[n])
+                return {k: self._combine(func, v) for k, v in grouped.items()}
+            sql, params = self._build_sql(fields=[expr], order=False)
+            return self._combine(func, [rows[0][0] for _, rows in self._run_shards(sql, params)])
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to execute {expr} on '{self.table_name}': {e}")
+            return None
+
+    # Internal method fetching one column of the merged, limited result
+    def _fieldValues(self, column: str):
+        saved = self._fields
+        self._fields = [column]
+        try:
+            return self.fetch().rows()
+        finally:
+            self._fields = saved
+
+    # Internal method merging per-shard (or per-row) aggregate values
+    @staticmethod
+    def _combine(func: str, values: list, per_row: bool = False):
+        present = [v for v in values if v is not None]
+        if func.startswith("COUNT"):
+            return len(present) if per_row else sum(present)
+        if not present:
+            return None
+        if func == "SUM":
+            return sum(present)
+        if func == "MIN":
+            return min(present)
+        return max(present)
+
+    # Internal method choosing the shards a query has to visit
+    def _targets(self):
+        key = self.router.keyFor(self.table_name)
+        if key is None:
+            return [0]
+        offset = 0
+        for clause in self._where_clauses:
+            if re.fullmatch(rf"\s*({re.escape(self.table_name)}\.)?{re.escape(key)}\s*=\s*\?\s*", clause):
+                return [self.router.shardFor(self._params[offset])]
+            offset += clause.count("?")
+        return list(range(len(self.router.shards)))
+
+    # Internal method executing a statement on the target shards in parallel threads, all under one
+    # time/step budget (the shards share the deadline and the VM-step count)
+    def _run_shards(self, sql: str, params):
+        targets = self._targets()
+        state = {}
+
+        def run(idx):
+            conn = self.router.shards[idx].connection
+            c = conn.cursor()
+            with self._guard.budget(conn, *self._budget, state=state):
+                c.execute(sql, list(params))
+                rows = c.fetchall()
+            return [d[0] for d in c.description] if c.description else [], rows
+
+        if len(targets) == 1:
+            return [run(targets[0])]
+        with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+            return list(pool.map(run, targets))
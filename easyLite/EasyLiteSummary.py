@@ -0,0 +1,151 @@
+# EasyLiteSummary.py
+import re
+import json
+import sqlite3
+from typing import Dict, List
+
+# Registry of summary tables and the query needed to rebuild them
+SUMMARY_REGISTRY = "easylite_summaries"
+
+_AGG_RE = re.compile(r"^\s*(COUNT|SUM|AVG)\s*\(\s*(\*|\w+)\s*\)\s*$", re.IGNORECASE)
+
+
+# Class for trigger-maintained summary tables (incremental materialized views)
+class EasyLiteSummary:
+    # Constructor
+    def __init__(self, connection: sqlite3.Connection, name: str):
+        self.connection = connection
+        self.name = name
+        self.state_table = f"{name}_state"
+
+    # Create the summary from a grouped query, backfill it and install maintenance triggers
+    def create(self, query, aggregates: Dict[str, str]):
+        groups = list(query._group_by_columns)
+        source = query.table_name
+        if not groups or not aggregates:
+            print("[ERROR] A summary table needs groupBy(...) columns and at least one aggregate.")
+            return self
+        parsed = {alias: _AGG_RE.match(expr) for alias, expr in aggregates.items()}
+        incremental = all(parsed.values()) and not query._where_clauses and not query._joins
+        if not incremental:
+            print(f"[WARNING] Summary '{self.name}' cannot be maintained incrementally, use refreshSummary() to update it.")
+        try:
+            c = self.connection.cursor()
+            c.execute(f"PRAGMA table_info({source});")
+            types = {col[1]: col[2] for col in c.fetchall()}
+            group_defs = [f"{g} {types.get(g, '')}".strip() for g in groups]
+            if incremental:
+                state_cols, select_exprs = self._incrementalColumns(parsed)
+            else:
+                state_cols = list(aggregates.keys())
+                select_exprs = list(aggregates.values())
+            # Explicit transaction: the legacy sqlite3 mode would autocommit each CREATE on its own
+            self.connection.commit()
+            c.execute("BEGIN;")
+            c.execute(f"CREATE TABLE IF NOT EXISTS {SUMMARY_REGISTRY} ( name TEXT PRIMARY KEY, source TEXT NOT NULL, select_sql TEXT NOT NULL, params TEXT, incremental INTEGER NOT NULL );")
+            c.execute(f"CREATE TABLE {self.state_table} ( {', '.join(group_defs + state_cols)} );")
+            c.execute(f"CREATE INDEX {self.state_table}_groups ON {self.state_table} ({', '.join(groups)});")
+            public = groups + list(aggregates.keys())
+            c.execute(f"CREATE VIEW {self.name} AS SELECT {', '.join(public)} FROM {self.state_table};")
+            select_sql, params = query._build_sql(fields=groups + select_exprs, order=False)
+            c.execute(f"INSERT INTO {SUMMARY_REGISTRY} (name, source, select_sql, params, incremental) VALUES (?, ?, ?, ?, ?);",
+                      (self.name, source, select_sql, json.dumps(list(params)), int(incremental)))
+            c.execute(f"INSERT INTO {self.state_table} {select_sql};", params)
+            if incremental:
+                self._createTriggers(c, source, groups, parsed)
+            c.execute("COMMIT;")
+            print(f"[SUCCESS] Summary table '{self.name}' created over '{source}' ({'incremental' if incremental else 'refresh only'}).")
+        except sqlite3.Error as e:
+            if self.connection.in_transaction:
+                c.execute("ROLLBACK;")
+            print(f"[ERROR] Failed to create summary table '{self.name}': {e}")
+        return self
+
+    # Recompute the whole summary from its source (fallback for non-incremental aggregates)
+    def refresh(self):
+        try:
+            c = self.connection.cursor()
+            c.execute(f"SELECT select_sql, params FROM {SUMMARY_REGISTRY} WHERE name = ?;", (self.name,))
+            row = c.fetchone()
+            if not row:
+                print(f"[ERROR] '{self.name}' is not a summary table.")
+                return self
+            select_sql, params = row[0], json.loads(row[1] or "[]")
+            c.execute(f"DELETE FROM {self.state_table};")
+            c.execute(f"INSERT INTO {self.state_table} {select_sql};", params)
+            self.connection.commit()
+            print(f"[SUCCESS] Summary table '{self.name}' refreshed.")
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            print(f"[ERROR] Failed to refresh summary table '{self.name}': {e}")
+        return self
+
+    # Remove the summary, its triggers and its registry entry
+    def drop(self):
+        try:
+            c = self.connection.cursor()
+            for op in ("insert", "update", "delete"):
+                c.execute(f"DROP TRIGGER IF EXISTS {self.name}_sum_{op};")
+            c.execute(f"DROP VIEW IF EXISTS {self.name};")
+            c.execute(f"DROP TABLE IF EXISTS {self.state_table};")
+            c.execute(f"DELETE FROM {SUMMARY_REGISTRY} WHERE name = ?;", (self.name,))
+            self.connection.commit()
+            print(f"[SUCCESS] Summary table '{self.name}' dropped.")
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to drop summary table '{self.name}': {e}")
+        return self
+
+    # Internal method listing state columns and the matching backfill expressions
+    def _incrementalColumns(self, parsed):
+        state_cols = ["_rows INTEGER"]
+        select_exprs = ["COUNT(*)"]
+        for alias, m in parsed.items():
+            func, arg = m.group(1).upper(), m.group(2)
+            if func == "COUNT":
+                state_cols.append(f"{alias} INTEGER")
+                select_exprs.append(f"COUNT({arg})")
+            else:
+                # SUM and AVG keep a running total and a non-NULL count, so all-NULL groups stay NULL
+                state_cols += [f"_sum_{alias}", f"_cnt_{alias} INTEGER", alias]
+                select_exprs += [f"COALESCE(SUM({arg}), 0)", f"COUNT({arg})", f"{func}({arg})"]
+        return state_cols, select_exprs
+
+    # Internal method building the SET clause that applies one row (ref is NEW or OLD, sign is + or -)
+    def _applySet(self, parsed, ref: str, sign: str) -> str:
+        sets = [f"_rows = _rows {sign} 1"]
+        for alias, m in parsed.items():
+            func, arg = m.group(1).upper(), m.group(2)
+            if func == "COUNT":
+                delta = "1" if arg == "*" else f"({ref}.{arg} IS NOT NULL)"
+                sets.append(f"{alias} = {alias} {sign} {delta}")
+            else:
+                new_sum = f"(_sum_{alias} {sign} COALESCE({ref}.{arg}, 0))"
+                new_cnt = f"(_cnt_{alias} {sign} ({ref}.{arg} IS NOT NULL))"
+                value = new_sum if func == "SUM" else f"{new_sum} * 1.0 / {new_cnt}"
+                sets.append(f"_sum_{alias} = {new_sum}")
+                sets.append(f"_cnt_{alias} = {new_cnt}")
+                sets.append(f"{alias} = CASE WHEN {new_cnt} > 0 THEN {value} END")
+        return ", ".join(sets)
+
+    # Internal method installing the insert/update/delete maintenance triggers
+    def _createTriggers(self, c, source: str, groups: List[str], parsed):
+        st = self.state_table
+        state_names = [col.split()[0] for col in self._incrementalColumns(parsed)[0]]
+        init = ", ".join("0" for _ in state_names)
+
+        def match(ref):
+            return " AND ".join(f"{g} IS {ref}.{g}" for g in groups)
+
+        def add(ref):
+            values = ", ".join(f"{ref}.{g}" for g in groups)
+            return (f"INSERT INTO {st} ({', '.join(groups + state_names)}) SELECT {values}, {init} "
+                    f"WHERE NOT EXISTS (SELECT 1 FROM {st} WHERE {match(ref)}); "
+                    f"UPDATE {st} SET {self._applySet(parsed, ref, '+')} WHERE {match(ref)};")
+
+        def remove(ref):
+            return (f"UPDATE {st} SET {self._applySet(parsed, ref, '-')} WHERE {match(ref)}; "
+                    f"DELETE FROM {st} WHERE {match(ref)} AND _rows <= 0;")
+
+        c.execute(f"CREATE TRIGGER {self.name}_sum_insert AFTER INSERT ON {source} BEGIN {add('NEW')} END;")
+        c.execute(f"CREATE TRIGGER {self.name}_sum_delete AFTER DELETE ON {source} BEGIN {remove('OLD')} END;")
+        c.execute(f"CREATE TRIGGER {self.name}_sum_update AFTER UPDATE ON {source} BEGIN {remove('OLD')} {add('NEW')} END;")
@@ -0,0 +1,112 @@
+# EasyLiteWriter.py
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, List, Sequence
+
+_STOP = object()
+
+
+# Single background writer that coalesces queued writes into group commits
+class EasyLiteWriter:
+    # Constructor
+    def __init__(self, connection: sqlite3.Connection, batch_size: int = 500, max_latency: float = 0.05, max_queue: int = 10000):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="easyLite-writer", daemon=True)
+        self._thread.start()
+
+    # Queue a statement (executed once per params tuple); blocks when the queue is full
+    def submit(self, sql: str, params_list: List[Sequence[Any]]) -> Future:
+        if self._closed:
+            raise RuntimeError("The write-behind queue has been shut down.")
+        future = Future()
+        self._queue.put((sql, params_list, future))
+        return future
+
+    # Read table metadata through the writer connection (usable from any thread)
+    def tableInfo(self, table_name: str):
+        c = self.connection.cursor()
+        c.execute(f"PRAGMA table_info({table_name});")
+        return c.fetchall()
+
+    # Wait until every queued write has been committed
+    def flush(self):
+        self._queue.join()
+
+    # Flush, stop the writer thread and release its connection
+    def shutdown(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.connection.close()
+
+    # Internal writer loop
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._commit(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                self._queue.task_done()
+                return
+
+    # Internal method writing one batch in a single transaction (a failing write only fails its own future)
+    def _commit(self, batch):
+        c = self.connection.cursor()
+        done = []
+        try:
+            c.execute("BEGIN;")
+            for sql, params_list, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                c.execute("SAVEPOINT easylite_write;")
+                try:
+                    count = 0
+                    for params in params_list:
+                        c.execute(sql, params)
+                        count += c.rowcount
+                    c.execute("RELEASE easylite_write;")
+                    done.append((future, count))
+                except sqlite3.Error as e:
+                    c.execute("ROLLBACK TO easylite_write;")
+                    c.execute("RELEASE easylite_write;")
+                    print(f"[ERROR] Write-behind statement failed: {e}")
+                    future.set_exception(e)
+            c.execute("COMMIT;")
+            for future, count in done:
+                future.set_result(count)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Write-behind group commit failed: {e}")
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            # Nothing of this batch was committed: fail every future that is still unresolved
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
@@ -6,4 +6,5 @@ print(  '\n $$$$$$$$$$$$$$$$$$$$',
         '\n $$$$$$$$$$$$$$$$$$$$',
         '\n')
 
-from .EasyLiteCore import EasyLiteCore as eL
\ No newline at end of file
+from .EasyLiteCore import EasyLiteCore as eL
+from .EasyLiteGuard import EasyLiteInterrupted, EasyLiteTimeout, EasyLiteCancelled
@@ -19,4 +19,7 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     python_requires=">=3.7",
+    extras_require={
+        "numpy": ["numpy"],
+    },
 )
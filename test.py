@@ -1,5 +1,19 @@
+import io
 import os
-from easyLite import eL
+import json
+import time
+import threading
+import urllib.error
+import urllib.request
+from easyLite import eL, EasyLiteTimeout, EasyLiteCancelled
+
+# Stream exposing only read(), like many network responses (no readinto, seek or tell)
+class ReadOnlyStream:
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+
+    def read(self, n: int = -1) -> bytes:
+        return self._data.read(n)
 
 def main():
     print('\n[Test] Initialization\n')
@@ -157,6 +171,177 @@ def main():
 
     print(res.toApiJSON())
 
+    print('\n[Test] Parallel scan of customers sorted by age\n')
+
+    db.select('customers').sortBy('age').parallel(2).fetch().show()
+    print(f"Streamed rows: {sum(1 for _ in db.select('customers').parallel(2).stream())}")
+
+    print('\n[Test] Aggregates on customers\n')
+
+    print(f"Count: {db.select('customers').count()}")
+    print(f"Anyone over 30: {db.select('customers').where('age > ?', 30).exists()}")
+    print(f"Distinct ages: {db.select('customers').fields('DISTINCT age').count()}")
+    print(f"Exists with limit 0: {db.select('customers').limit(0).exists()}")
+    print(f"Average age: {db.select('customers').avg('age')}")
+    print(f"Max age per country: {db.select('customers').groupBy('country_id').max('age')}")
+
+    print('\n[Test] Full-text search on customers\n')
+
+    db.modTable('customers').fullText('name', 'email')
+    db.select('customers').fields('customers.name', 'customers.email').match('it', snippet='email').fetch().show()
+
+    print('\n[Test] Fetching customers as NumPy arrays\n')
+
+    print(db.select('customers').fields('name', 'age').fetchArrays())
+    print(db.select('no_such_table').fetchArrays())
+    print(db.executeCustomQuery("SELECT 1 AS n UNION ALL SELECT 2.5 UNION ALL SELECT 'n/a'").toArrays())
+
+    print('\n[Test] In-memory copy of the database\n')
+
+    mem = eL().connectInMemory('test_store.db')
+    print(f"Customers in memory: {mem.select('customers').count()}")
+    mem.persist('test_memory.db')
+    eL().connectInMemory().persist()
+    mem.close()
+
+    print('\n[Test] Change tracking on customers\n')
+
+    db.modTable('customers').trackChanges()
+    watermark = db.changeWatermark('customers')
+    db.updateIn('customers').field('age', 41).where('name = ?', 'Luigi').record()
+    db.changesSince('customers', watermark).show()
+    db.changesSince('no_such_table', watermark)
+
+    print('\n[Test] Write-behind queue\n')
+
+    wb = eL().connect('test_store.db')
+    wb.writeBehind(batch_size=10, max_latency=0.01)
+    rec = wb.insertIn('countries').field('name', 'Spain').record()
+    print(f"Rows written: {rec.future.result(timeout=5)}")
+    bad = wb.insertIn('countries').field('name', None).record()
+    try:
+        bad.future.result(timeout=5)
+    except Exception as e:
+        print(f"Queued write failed as expected: {e}")
+    wb.close()
+    eL().connectInMemory().writeBehind()
+
+    print('\n[Test] Summary table of customers per country\n')
+
+    db.select('customers').groupBy('country_id').summaryTable('customers_by_country', n='COUNT(*)', avg_age='AVG(age)')
+    db.select('customers_by_country').fetch().show()
+    db.select('customers').groupBy('country_id').summaryTable('broken_summary', x='MAX(no_such_col)')
+
+    print('\n[Test] Compressed columns and BLOB streaming\n')
+
+    db.newTable('documents') \
+      .PK() \
+      .textCol('payload', codec='zlib') \
+      .blobCol('attachment') \
+      .create()
+    db.insertIn('documents').row('easyLite ' * 5, None).record()
+    db.select('documents').fields('id', 'payload AS body').fetch().show()
+    db.modTable('customers').compressCol('email')
+    db.storeBlob('documents', 'attachment', 1, io.BytesIO(b'binary payload'))
+    out = io.BytesIO()
+    db.loadBlob('documents', 'attachment', 1, out)
+    print(out.getvalue())
+    db.storeBlob('documents', 'attachment', 1, ReadOnlyStream(b'read() only'), size=11, chunk_size=4)
+    out = io.BytesIO()
+    db.loadBlob('documents', 'attachment', 1, out)
+    print(out.getvalue())
+    db.storeBlob('documents', 'attachment', 1, ReadOnlyStream(b'no size'))
+    db.storeBlob('documents', 'attachment', 99, io.BytesIO(b'missing row'))
+    db.storeBlob('documents', 'payload', 1, io.BytesIO(b'compressed column'))
+
+    print('\n[Test] Sharded events table\n')
+
+    shard_files = ['test_shard_0.db', 'test_shard_1.db', 'test_shard_2.db']
+    sh = eL().connectSharded(shard_files, shard_key='user_id')
+    sh.newTable('events').PK().intCol('user_id').textCol('kind').create()
+    sh.insertIn('events').multiRows([[u, 'login' if u % 2 else 'logout'] for u in range(9)]).record()
+    sh.select('events').fields('user_id', 'kind').sortBy('user_id', False).limit(3).fetch().show()
+    sh.select('events').fields('kind', 'COUNT(*)').groupBy('kind').sortBy('kind').fetch().show()
+    sh.select('events').fields('kind', 'GROUP_CONCAT(user_id)').groupBy('kind').fetch()
+    print(sh.select('events').fields('user_id').fetchArrays()['user_id'])
+    sh.select('events').where('user_id = ?', '4').fetch().show()
+    sh.select('events').groupBy('kind').summaryTable('events_by_kind', n='COUNT(*)')
+    sh.close()
+
+    print('\n[Test] Query budgets\n')
+
+    print(f"Count under a budget: {db.select('customers').timeout(1).count()}")
+    try:
+        db.executeCustomQuery("WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT COUNT(*) FROM n", timeout=0.1)
+    except EasyLiteTimeout as e:
+        print(f"Stopped as expected: {e}")
+    db.cancel()
+    print(f"Count after an idle cancel(): {db.select('customers').count()}")
+    threading.Timer(0.1, db.cancel).start()
+    try:
+        db.executeCustomQuery("WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT COUNT(*) FROM n", timeout=5)
+    except EasyLiteCancelled as e:
+        print(f"Stopped as expected: {e}")
+
+    print('\n[Test] Maintenance\n')
+
+    print(db.runMaintenance('optimize', 'integrity'))
+    db.runMaintenance('no_such_task')
+    mt = eL().connect('test_store.db')
+    mt.newTable('visits').PK().intCol('page').create()
+    mt.writeBehind()
+    mt.startMaintenance(interval=None, write_threshold=3, poll=0.05)
+    for page in range(3):
+        mt.insertIn('visits').field('page', page).record()
+    mt.flush()
+    time.sleep(0.3)
+    print(f"Tasks run after write-behind inserts: {list(mt.maintenance.last_report)}")
+    mt.close()
+
+    print('\n[Test] Bulk load\n')
+
+    with db.bulkLoad('countries') as bulk:
+        bulk.rows([['Germany'], ['Portugal']], columns=['name'])
+    print(f"Committed: {bulk.ok}, rows: {bulk.inserted}")
+    with db.bulkLoad('documents') as bulk:
+        bulk.rows([['bulk-loaded ' * 20, None]])
+    print(f"Stored as: {db.executeCustomQuery('SELECT typeof(payload) FROM documents ORDER BY id DESC LIMIT 1').rows()}")
+    with db.bulkLoad('customers') as bulk:
+        bulk.rows([['Ghost', 'ghost@mail.xx', 50, None, 999]], columns=['name', 'email', 'age', 'height', 'country_id'])
+        db.executeCustomQuery("SELECT COUNT(*) FROM customers")
+    print(f"Committed: {bulk.ok}, ghosts left: {db.select('customers').where('name = ?', 'Ghost').count()}")
+
+    print('\n[Test] Countries with their customers\n')
+
+    print(db.select('countries').include('customers').limit(2).fetch().toJSON())
+    db.select('countries').include('documents').fetch()
+
+    print('\n[Test] HTTP read service\n')
+
+    server = db.serve(port=0)
+    base = f"http://127.0.0.1:{server.address[1]}"
+    print(urllib.request.urlopen(f"{base}/customers?fields=id,name&sort=age&limit=2").read().decode())
+    try:
+        urllib.request.urlopen(f"{base}/customers?fields=password")
+    except urllib.error.HTTPError as e:
+        print(e.code, json.loads(e.read())['message'])
+    for path in ('/customers?limit=-1', '/easylite_changes'):
+        try:
+            urllib.request.urlopen(base + path)
+        except urllib.error.HTTPError as e:
+            print(e.code, json.loads(e.read())['message'])
+    server.stop()
+
+    print('\n[Test] Copying tables to another database\n')
+
+    db.copyTable('customers', 'test_copy.db', where='age > ?', params=(20,), chunk_size=2,
+                 progress=lambda done, total: print(f"{done}/{total} rows"))
+    db.copyTable('no_such_table', 'test_copy.db')
+    db.snapshot('test_snapshot.db')
+
+    for f in shard_files + ['test_memory.db', 'test_copy.db', 'test_snapshot.db']:
+        os.remove(f)
+
     # print('\n[Test] Exporting result to .csv file\n')
 
     # res.exportCSV("test.csv")